@@ -0,0 +1,339 @@
+"""Headless HTTP API for the task engine
+
+Serves the same workspaces as the Streamlit app from a local asyncio server, with
+batched endpoints for automation and load tests:
+
+    POST /v1/tasks/bulk_add       {"tasks": [{"title", "category", "priority", "due_date", ...}]}
+    POST /v1/tasks/bulk_complete  {"ids": [1, 2, 3]}
+    GET  /v1/tasks?offset=0&limit=25&category=Work&priority=High&due_from=&due_to=&q=
+    GET  /v1/insights
+
+Every endpoint takes an optional ?workspace=name (default: the default workspace).
+The API can run next to the app on the same database files: stores take ids from
+SQLite's sequence and reload their in-memory indexes when another process commits.
+
+    python api_server.py --port 8780
+    python api_server.py --measure 100000
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from config import AppConfig
+from guidance_backends import GuidanceBackend
+from metrics import registry as perf
+from scoring import RescoringEngine
+from task_engine import TaskEngine, create_guidance_backend
+from workspaces import WorkspaceRegistry
+
+# Requests with a larger body are answered 413 without reading it
+MAX_BODY_BYTES = 32 * 2 ** 20
+MAX_PAGE_SIZE = 1000
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class APIError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class TaskAPIServer:
+    """asyncio HTTP/1.1 server in front of per-workspace task engines
+
+    Connections are parsed on the event loop and kept alive between requests.
+    Store calls block on SQLite, so they run on a small thread pool; each store
+    serializes its own writes, and bulk endpoints commit in one transaction.
+    """
+
+    def __init__(self, workspaces: WorkspaceRegistry, guidance: GuidanceBackend,
+                 rescoring: Optional[RescoringEngine] = None, host: str = "127.0.0.1", port: int = 8780,
+                 threads: int = 8):
+        self.workspaces = workspaces
+        self.guidance = guidance
+        self.rescoring = rescoring or RescoringEngine()
+        self.host = host
+        self.port = port
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="task-api")
+        self._routes: Dict[str, Dict[str, Callable]] = {
+            "/v1/tasks/bulk_add": {"POST": self.bulk_add},
+            "/v1/tasks/bulk_complete": {"POST": self.bulk_complete},
+            "/v1/tasks": {"GET": self.list_tasks},
+            "/v1/insights": {"GET": self.insights}
+        }
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._connections: Set[asyncio.StreamWriter] = set()
+
+    # Endpoints; each runs on the thread pool with one workspace leased
+
+    def bulk_add(self, engine: TaskEngine, params: Dict[str, List[str]], body: Dict) -> Dict:
+        rows = body.get("tasks")
+        if not isinstance(rows, list):
+            raise APIError(400, 'Expected {"tasks": [...]}')
+        added, errors = engine.add_tasks(rows)
+        return {
+            "added": [task["id"] for task in added],
+            "errors": [{"index": index, "error": error} for index, error in errors]
+        }
+
+    def bulk_complete(self, engine: TaskEngine, params: Dict[str, List[str]], body: Dict) -> Dict:
+        ids = body.get("ids")
+        # JSON true/false decode to bool, which is a subclass of int
+        if not isinstance(ids, list) or not all(isinstance(task_id, int) and not isinstance(task_id, bool)
+                                                for task_id in ids):
+            raise APIError(400, 'Expected {"ids": [...]} with integer ids')
+        completed = engine.complete_tasks(ids)
+        done = set(completed)
+        return {"completed": completed, "not_active": [task_id for task_id in ids if task_id not in done]}
+
+    def list_tasks(self, engine: TaskEngine, params: Dict[str, List[str]], body: Dict) -> Dict:
+        try:
+            offset = max(0, int(params.get("offset", ["0"])[0]))
+            limit = min(MAX_PAGE_SIZE, max(1, int(params.get("limit", [str(AppConfig.TASK_PAGE_SIZE)])[0])))
+        except ValueError:
+            raise APIError(400, "offset and limit must be integers")
+        engine.rescore()
+        total, tasks = engine.ranked(
+            offset, limit, query=params.get("q", [""])[0],
+            categories=params.get("category"), priorities=params.get("priority"),
+            due_from=params.get("due_from", [None])[0], due_to=params.get("due_to", [None])[0]
+        )
+        return {"total": total, "offset": offset, "limit": limit, "tasks": tasks}
+
+    def insights(self, engine: TaskEngine, params: Dict[str, List[str]], body: Dict) -> Dict:
+        return engine.insights()
+
+    # HTTP plumbing
+
+    def _call(self, handler: Callable, workspace: Optional[str], params: Dict[str, List[str]],
+              body: Dict) -> Dict:
+        with self.workspaces.lease(workspace) as store:
+            engine = TaskEngine(store, self.guidance, self.rescoring, name=workspace,
+                                on_guidance=self._deliver_guidance)
+            with perf.span(f"api.{handler.__name__}"):
+                return handler(engine, params, body)
+
+    def _deliver_guidance(self, key: Tuple, guidance: str):
+        workspace, task_id = key
+        with self.workspaces.lease(workspace) as store:
+            store.update_guidance(task_id, guidance)
+
+    async def _dispatch(self, method: str, target: str, raw_body: bytes) -> Tuple[int, Dict]:
+        url = urlsplit(target)
+        methods = self._routes.get(url.path)
+        if methods is None:
+            return 404, {"error": f"No endpoint {url.path}"}
+        handler = methods.get(method)
+        if handler is None:
+            return 405, {"error": f"{url.path} accepts {', '.join(methods)}"}
+
+        params = parse_qs(url.query)
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+            if not isinstance(body, dict):
+                raise ValueError("Expected a JSON object")
+            workspace = params.get("workspace", [None])[0]
+            result = await self._loop.run_in_executor(self._executor, self._call, handler, workspace, params, body)
+        except APIError as error:
+            return error.status, {"error": str(error)}
+        except ValueError as error:
+            return 400, {"error": str(error)}
+        return 200, result
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                    length = int(headers.get("content-length", 0))
+                    if length < 0:
+                        raise ValueError("negative Content-Length")
+                except ValueError:
+                    status, payload, keep_alive = 400, {"error": "Malformed request"}, False
+                else:
+                    if length > MAX_BODY_BYTES:
+                        status, payload, keep_alive = 413, {"error": f"Body exceeds {MAX_BODY_BYTES} bytes"}, False
+                    else:
+                        raw_body = await reader.readexactly(length) if length else b""
+                        try:
+                            status, payload = await self._dispatch(method, target, raw_body)
+                        except Exception as error:
+                            status, payload = 500, {"error": f"{type(error).__name__}: {error}"}
+
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    # Lifecycle
+
+    async def serve(self):
+        """Serve until cancelled"""
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start(self) -> int:
+        """Serve on a daemon thread; returns the bound port (useful with port 0)"""
+        started = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            self._loop = loop
+            self._server = loop.run_until_complete(
+                asyncio.start_server(self._handle_connection, self.host, self.port)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            started.set()
+            loop.run_forever()
+            loop.run_until_complete(self._shutdown())
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="task-api", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.port
+
+    async def _shutdown(self):
+        """Stop accepting connections and let the open ones finish on end of stream"""
+        self._server.close()
+        for writer in list(self._connections):
+            writer.close()
+        handlers = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    def stop(self):
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+        self._executor.shutdown(wait=True)
+
+
+def create_server(host: str = "127.0.0.1", port: int = 8780,
+                  workspaces: Optional[WorkspaceRegistry] = None) -> TaskAPIServer:
+    """API server over the app's workspaces and guidance backend settings"""
+    workspaces = workspaces or WorkspaceRegistry(
+        AppConfig.WORKSPACE_DIR, AppConfig.DATABASE_PATH,
+        default_name=AppConfig.DEFAULT_WORKSPACE, max_open=AppConfig.MAX_OPEN_WORKSPACES
+    )
+    return TaskAPIServer(workspaces, create_guidance_backend(), host=host, port=port)
+
+
+def measure(tasks: int, batch_size: int, workspace: str = "loadtest") -> Dict:
+    """Bulk-add, list and bulk-complete `tasks` tasks through a local server and report throughput
+
+    Runs against throwaway workspaces in a temporary directory.
+    """
+    from benchmarks.synthetic import iter_tasks
+
+    data_dir = tempfile.mkdtemp()
+    server = create_server(port=0, workspaces=WorkspaceRegistry(data_dir, os.path.join(data_dir, "tasks.db")))
+    port = server.start()
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+
+    def call(method: str, path: str, payload: Optional[Dict] = None) -> Dict:
+        conn.request(method, f"{path}{'&' if '?' in path else '?'}workspace={workspace}",
+                     body=json.dumps(payload) if payload is not None else None,
+                     headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        result = json.loads(response.read())
+        if response.status != 200:
+            raise RuntimeError(f"{method} {path} -> {response.status}: {result}")
+        return result
+
+    fields = ("title", "description", "category", "priority", "due_date")
+    rows = [{field: task[field] for field in fields} for task in iter_tasks(tasks, completed_ratio=0.0)]
+    results = {"tasks": tasks, "batch_size": batch_size}
+
+    started = time.perf_counter()
+    ids = []
+    for start in range(0, len(rows), batch_size):
+        ids.extend(call("POST", "/v1/tasks/bulk_add", {"tasks": rows[start:start + batch_size]})["added"])
+    elapsed = time.perf_counter() - started
+    results["bulk_add_per_second"] = round(len(ids) / elapsed, 1)
+
+    pages = 200
+    started = time.perf_counter()
+    for page in range(pages):
+        call("GET", f"/v1/tasks?offset={page * AppConfig.TASK_PAGE_SIZE}&limit={AppConfig.TASK_PAGE_SIZE}")
+    results["ranked_pages_per_second"] = round(pages / (time.perf_counter() - started), 1)
+
+    started = time.perf_counter()
+    completed = 0
+    for start in range(0, len(ids), batch_size):
+        completed += len(call("POST", "/v1/tasks/bulk_complete", {"ids": ids[start:start + batch_size]})["completed"])
+    elapsed = time.perf_counter() - started
+    results["bulk_complete_per_second"] = round(completed / elapsed, 1)
+    results["insights"] = call("GET", "/v1/insights")
+
+    conn.close()
+    server.stop()
+    server.workspaces.close()
+    shutil.rmtree(data_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8780)
+    parser.add_argument("--measure", type=int, metavar="N",
+                        help="instead of serving, push N tasks through a local server and print throughput")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.batch_size), indent=2))
+        return
+
+    server = create_server(args.host, args.port)
+    print(f"Task API listening on http://{args.host}:{args.port}/v1/")
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
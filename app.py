@@ -1,127 +1,187 @@
 import streamlit as st
-import pandas as pd
+import itertools
 import json
+import os
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-import plotly.express as px
-import plotly.graph_objects as go
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Tuple
 import random
 
-# Initialize session state
-if 'tasks' not in st.session_state:
-    st.session_state.tasks = []
-if 'completed_tasks' not in st.session_state:
-    st.session_state.completed_tasks = []
+import timeline
+from cache import LRUCache
+from config import AppConfig
+from export import EXPORT_CHUNK_ROWS, EXPORT_FORMATS, available_formats, export_file_name, export_tasks
+from guidance_backends import GuidanceBackend
+from importer import IMPORT_FORMATS, import_tasks
+from insights import InsightsAggregator
+from metrics import registry as perf
+from scoring import RescoringEngine
+from task_engine import TaskEngine, create_guidance_backend
+from task_store import ConcurrentModificationError, TaskStore
+from workspaces import WorkspaceRegistry, normalize_workspace
+
+@st.cache_resource
+def get_workspaces() -> WorkspaceRegistry:
+    """Workspace task stores shared by every session in this process"""
+    return WorkspaceRegistry(AppConfig.WORKSPACE_DIR, AppConfig.DATABASE_PATH,
+                             default_name=AppConfig.DEFAULT_WORKSPACE, max_open=AppConfig.MAX_OPEN_WORKSPACES)
+
+@st.cache_resource
+def get_guidance_backend() -> GuidanceBackend:
+    """Guidance backend shared by every session, with templates compiled once per process"""
+    return create_guidance_backend()
+
+@st.cache_resource
+def get_figure_cache() -> LRUCache:
+    """Analytics figures shared by every session, keyed on the store's data version"""
+    return LRUCache(AppConfig.FIGURE_CACHE_SIZE)
+
+@st.cache_resource
+def get_rescoring_engine() -> RescoringEngine:
+    """Re-scoring engine shared by every workspace's task store"""
+    return RescoringEngine()
+
+# Static content, built once per process rather than on every rerun
+PRODUCTIVITY_TIPS = (
+    "Break large tasks into smaller, manageable chunks",
+    "Use the 2-minute rule: if it takes less than 2 minutes, do it now",
+    "Time-block your calendar for focused work sessions",
+    "Batch similar tasks together to maintain focus",
+    "Take regular breaks using the Pomodoro technique",
+    "Review and adjust your priorities weekly",
+    "Eliminate or delegate low-priority tasks",
+    "Set specific deadlines for open-ended tasks"
+)
+
+MOTIVATION_QUOTES = (
+    "The way to get started is to quit talking and begin doing. - Walt Disney",
+    "Don't watch the clock; do what it does. Keep going. - Sam Levenson",
+    "You don't have to be great to get started, but you have to get started to be great. - Les Brown",
+    "Success is the sum of small efforts repeated day in and day out. - Robert Collier"
+)
+
+SUGGESTION_CATEGORIES = {
+    "Health & Wellness": ("Take a 10-minute walk", "Drink 8 glasses of water today", "Practice 5 minutes of meditation"),
+    "Professional Growth": ("Update your LinkedIn profile", "Read one industry article", "Network with one colleague"),
+    "Personal Development": ("Learn something new for 15 minutes", "Practice a hobby", "Call a friend or family member"),
+    "Organization": ("Declutter your workspace", "Review your goals", "Plan tomorrow's priorities")
+}
 
 class AIToDoApp:
-    def __init__(self):
-        self.productivity_tips = [
-            "Break large tasks into smaller, manageable chunks",
-            "Use the 2-minute rule: if it takes less than 2 minutes, do it now",
-            "Time-block your calendar for focused work sessions",
-            "Batch similar tasks together to maintain focus",
-            "Take regular breaks using the Pomodoro technique",
-            "Review and adjust your priorities weekly",
-            "Eliminate or delegate low-priority tasks",
-            "Set specific deadlines for open-ended tasks"
-        ]
-        
-        self.motivation_quotes = [
-            "The way to get started is to quit talking and begin doing. - Walt Disney",
-            "Don't watch the clock; do what it does. Keep going. - Sam Levenson",
-            "You don't have to be great to get started, but you have to get started to be great. - Les Brown",
-            "Success is the sum of small efforts repeated day in and day out. - Robert Collier"
-        ]
+    def __init__(self, store: Optional[TaskStore] = None):
+        # A fixed store skips the workspace registry, e.g. when driving the app from scripts
+        self.fixed_store = store
+        self.store = store
+        self.workspace = None
+        self.workspaces = get_workspaces()
+        self.rescoring = get_rescoring_engine()
+        self.guidance = get_guidance_backend()
+        self.figure_cache = get_figure_cache()
+        self.engine = self.make_engine(store) if store is not None else None
+        self.productivity_tips = PRODUCTIVITY_TIPS
+        self.motivation_quotes = MOTIVATION_QUOTES
 
     def generate_ai_guidance(self, task_title: str, priority: str, category: str) -> str:
         """Generate AI-based guidance for task completion"""
-        guidance_templates = {
-            "High": [
-                f"🎯 **High Priority Alert**: '{task_title}' requires immediate attention. Consider dedicating your peak energy hours to this task.",
-                f"⚡ **Focus Strategy**: For '{task_title}', eliminate distractions and use time-blocking. Set a specific deadline and break it into 25-minute focus sessions.",
-                f"🔥 **Urgent Task**: '{task_title}' should be your top priority today. Consider what you can delegate or postpone to focus on this."
-            ],
-            "Medium": [
-                f"📋 **Balanced Approach**: '{task_title}' is important but manageable. Schedule it during your moderately productive hours.",
-                f"⏰ **Time Management**: For '{task_title}', set a realistic timeline and consider batching it with similar tasks in your {category.lower()} category.",
-                f"📊 **Strategic Planning**: '{task_title}' contributes to your goals. Plan specific steps and allocate adequate time."
-            ],
-            "Low": [
-                f"🌱 **When Time Permits**: '{task_title}' can be done during low-energy periods or as a break from more intensive tasks.",
-                f"🔄 **Batch Processing**: Consider grouping '{task_title}' with other {category.lower()} tasks for efficiency.",
-                f"📝 **Quick Wins**: '{task_title}' might be a good warm-up task to build momentum for your day."
-            ]
-        }
-        
-        category_specific_tips = {
-            "Work": "💼 Consider your work environment, deadlines, and team dependencies.",
-            "Personal": "🏠 Think about your personal energy levels and home environment.",
-            "Health": "💪 Remember that consistency is key for health-related goals.",
-            "Learning": "📚 Use active learning techniques and spaced repetition.",
-            "Finance": "💰 Consider long-term impact and set measurable milestones.",
-            "Other": "🎯 Define clear success criteria and next steps."
-        }
-        
-        base_guidance = random.choice(guidance_templates.get(priority, guidance_templates["Medium"]))
-        category_tip = category_specific_tips.get(category, category_specific_tips["Other"])
-        
-        return f"{base_guidance}\n\n{category_tip}"
+        return self.guidance.generate(task_title, priority, category)
+
+    def generate_ai_guidance_batch(self, items: List[Tuple[str, str, str]]) -> List[str]:
+        """Generate guidance for many (title, priority, category) tuples at once"""
+        return self.guidance.generate_many(items)
+
+    def make_engine(self, store: TaskStore) -> TaskEngine:
+        """Task engine over a store, sharing this process's guidance and rescoring"""
+        return TaskEngine(store, self.guidance, self.rescoring, name=self.workspace,
+                          on_guidance=self.deliver_guidance)
+
+    def add_task(self, task: Dict) -> Dict:
+        """Store a task with its template guidance and ask the backend for a refined version"""
+        return self.engine.add_task(task)
 
-    def calculate_priority_score(self, priority: str, days_until_due: int, category: str) -> float:
+    def deliver_guidance(self, key: Tuple, guidance: str):
+        """Store model guidance, reopening the workspace if it was closed in the meantime"""
+        workspace, task_id = key
+        if self.fixed_store is not None:
+            self.fixed_store.update_guidance(task_id, guidance)
+            return
+        with self.workspaces.lease(workspace) as store:
+            store.update_guidance(task_id, guidance)
+
+    def calculate_priority_score(self, priority: str, days_until_due: Optional[int], category: str) -> float:
         """Calculate smart priority score based on multiple factors"""
-        priority_weights = {"High": 10, "Medium": 6, "Low": 3}
-        category_weights = {"Work": 1.2, "Health": 1.1, "Personal": 1.0, "Learning": 0.9, "Finance": 1.15, "Other": 0.8}
-        
-        base_score = priority_weights.get(priority, 6)
-        category_multiplier = category_weights.get(category, 1.0)
-        
-        # Urgency factor based on due date
-        if days_until_due <= 1:
-            urgency_multiplier = 2.0
-        elif days_until_due <= 3:
-            urgency_multiplier = 1.5
-        elif days_until_due <= 7:
-            urgency_multiplier = 1.2
-        else:
-            urgency_multiplier = 1.0
-            
-        return base_score * category_multiplier * urgency_multiplier
+        return self.rescoring.scorer.score(priority, days_until_due, category)
 
-    def get_productivity_insights(self, tasks: List[Dict], completed_tasks: List[Dict]) -> Dict:
+    @perf.timed("insights")
+    def get_productivity_insights(self, tasks: Optional[List[Dict]] = None,
+                                  completed_tasks: Optional[List[Dict]] = None) -> Dict:
         """Generate productivity analytics and insights"""
-        total_tasks = len(tasks) + len(completed_tasks)
-        completion_rate = (len(completed_tasks) / total_tasks * 100) if total_tasks > 0 else 0
-        
-        # Category analysis
-        all_tasks = tasks + completed_tasks
-        category_counts = {}
-        priority_counts = {}
+        if tasks is None and completed_tasks is None:
+            return self.engine.insights()
         
-        for task in all_tasks:
-            category = task.get('category', 'Other')
-            priority = task.get('priority', 'Medium')
-            
-            category_counts[category] = category_counts.get(category, 0) + 1
-            priority_counts[priority] = priority_counts.get(priority, 0) + 1
+        # Ad-hoc task lists get a throwaway aggregator
+        return InsightsAggregator.from_tasks(tasks or [], completed_tasks or []).snapshot()
+
+    def cached_figure(self, key: Tuple, build: Callable):
+        """Reuse a figure until the task data changes"""
+        versioned_key = (self.store.path, self.store.data_version, *key)
+        figure = self.figure_cache.get(versioned_key)
+        if figure is None:
+            figure = build()
+            self.figure_cache.put(versioned_key, figure)
+        return figure
+
+    @perf.timed("figure.category")
+    def build_category_figure(self, category_distribution: Dict[str, int]):
+        import plotly.express as px  # deferred: plotly is only needed once a chart is drawn
+
+        return px.pie(
+            values=list(category_distribution.values()),
+            names=list(category_distribution.keys()),
+            title="Task Distribution by Category"
+        )
+
+    @perf.timed("figure.priority")
+    def build_priority_figure(self, priority_distribution: Dict[str, int]):
+        import plotly.express as px
+
+        colors = {'High': '#FF6B6B', 'Medium': '#FFE66D', 'Low': '#4ECDC4'}
+        return px.bar(
+            x=list(priority_distribution.keys()),
+            y=list(priority_distribution.values()),
+            title="Task Distribution by Priority",
+            color=list(priority_distribution.keys()),
+            color_discrete_map=colors
+        )
+
+    @perf.timed("figure.timeline")
+    def build_timeline_figure(self, productivity_data: List[Dict], period: str):
+        import plotly.graph_objects as go
+
+        buckets = [row['bucket'] for row in productivity_data]
         
-        # Overdue tasks
-        overdue_count = 0
-        today = datetime.now().date()
+        fig_timeline = go.Figure()
+        fig_timeline.add_trace(go.Scatter(
+            x=buckets,
+            y=[row['completed'] for row in productivity_data],
+            mode='lines+markers',
+            name='Tasks Completed',
+            line=dict(color='green')
+        ))
+        fig_timeline.add_trace(go.Scatter(
+            x=buckets,
+            y=[row['added'] for row in productivity_data],
+            mode='lines+markers',
+            name='Tasks Added',
+            line=dict(color='blue')
+        ))
         
-        for task in tasks:
-            if task.get('due_date'):
-                due_date = datetime.strptime(task['due_date'], '%Y-%m-%d').date()
-                if due_date < today:
-                    overdue_count += 1
-        
-        return {
-            "total_tasks": total_tasks,
-            "completion_rate": completion_rate,
-            "overdue_count": overdue_count,
-            "category_distribution": category_counts,
-            "priority_distribution": priority_counts,
-            "active_tasks": len(tasks)
-        }
+        fig_timeline.update_layout(
+            title=f'{period} Productivity Overview',
+            xaxis_title='Date',
+            yaxis_title='Number of Tasks',
+            hovermode='x unified'
+        )
+        return fig_timeline
 
     def run(self):
         st.set_page_config(
@@ -136,16 +196,77 @@ class AIToDoApp:
         
         # Sidebar for navigation
         st.sidebar.title("📋 Navigation")
-        page = st.sidebar.selectbox("Choose a page:", 
-                                   ["Task Manager", "AI Insights", "Analytics Dashboard"])
-        
-        if page == "Task Manager":
-            self.task_manager_page()
-        elif page == "AI Insights":
-            self.ai_insights_page()
-        else:
-            self.analytics_page()
+        pages = ["Task Manager", "AI Insights", "Analytics Dashboard"]
+        # The performance panel stays hidden unless enabled in config or with ?perf=1
+        if AppConfig.SHOW_PERFORMANCE_PAGE or st.query_params.get("perf") == "1":
+            pages.append("Performance")
+        page = st.sidebar.selectbox("Choose a page:", pages)
+        workspace = self.workspace_selector()
+        
+        with perf.span("rerun"), self.open_workspace(workspace):
+            self.archive_old_tasks()
+            if page == "Task Manager":
+                self.task_manager_page()
+            elif page == "AI Insights":
+                self.ai_insights_page()
+            elif page == "Performance":
+                self.performance_page()
+            else:
+                self.analytics_page()
+
+    def workspace_selector(self) -> str:
+        """Sidebar picker for the shared workspace; ?workspace=name links straight to one"""
+        st.sidebar.markdown("### 👥 Workspace")
+        default = self.workspaces.default_name
+        current = st.session_state.get('workspace') or st.query_params.get("workspace") or default
+        try:
+            current = normalize_workspace(current)
+        except ValueError:
+            current = default
+        
+        names = self.workspaces.names()
+        if current not in names:
+            names.append(current)
+        selected = st.sidebar.selectbox("Shared with everyone who opens it", names, index=names.index(current))
+        
+        with st.sidebar.form("join_workspace", clear_on_submit=True):
+            new_name = st.text_input("Create or join", placeholder="e.g. team-alpha")
+            if st.form_submit_button("Open") and new_name.strip():
+                try:
+                    selected = normalize_workspace(new_name)
+                except ValueError as error:
+                    st.error(str(error))
+        
+        st.session_state.workspace = selected
+        st.query_params["workspace"] = selected
+        return selected
+
+    @contextmanager
+    def open_workspace(self, workspace: str):
+        """Lease the workspace's shared store for one rerun"""
+        self.workspace = workspace
+        if self.fixed_store is not None:
+            self.engine = self.make_engine(self.fixed_store)
+            yield self.fixed_store
+            return
+        with self.workspaces.lease(workspace) as store:
+            self.store = store
+            self.engine = self.make_engine(store)
+            try:
+                yield store
+            finally:
+                self.store = self.engine = None
+
+    def archive_old_tasks(self):
+        """Move tasks completed more than ARCHIVE_AFTER_DAYS ago to archive segments, once a day"""
+        if AppConfig.ARCHIVE_AFTER_DAYS <= 0:
+            return
+        cutoff = (datetime.now().date() - timedelta(days=AppConfig.ARCHIVE_AFTER_DAYS)).strftime('%Y-%m-%d')
+        if self.store.archived_before != cutoff:
+            with perf.span("archive"):
+                self.store.archive_completed(cutoff)
 
+    @perf.timed("page.task_manager")
     def task_manager_page(self):
         st.header("📝 Task Management")
         
@@ -156,10 +277,10 @@ class AIToDoApp:
         with col1:
             task_title = st.text_input("Task Title", placeholder="Enter your task...")
             category = st.selectbox("Category", 
-                                   ["Work", "Personal", "Health", "Learning", "Finance", "Other"])
+                                   AppConfig.TASK_CATEGORIES)
             
         with col2:
-            priority = st.selectbox("Priority", ["High", "Medium", "Low"])
+            priority = st.selectbox("Priority", AppConfig.TASK_PRIORITIES)
             due_date = st.date_input("Due Date", min_value=datetime.now().date())
         
         task_description = st.text_area("Description (Optional)", 
@@ -167,71 +288,148 @@ class AIToDoApp:
         
         if st.button("🎯 Add Task with AI Guidance", type="primary"):
             if task_title:
-                # Calculate days until due
-                days_until_due = (due_date - datetime.now().date()).days
-                
-                new_task = {
-                    "id": len(st.session_state.tasks) + len(st.session_state.completed_tasks) + 1,
-                    "title": task_title,
-                    "description": task_description,
-                    "category": category,
-                    "priority": priority,
-                    "due_date": due_date.strftime('%Y-%m-%d'),
-                    "created_date": datetime.now().strftime('%Y-%m-%d %H:%M'),
-                    "priority_score": self.calculate_priority_score(priority, days_until_due, category),
-                    "ai_guidance": self.generate_ai_guidance(task_title, priority, category)
-                }
-                
-                st.session_state.tasks.append(new_task)
+                new_task = self.engine.new_task(task_title, category, priority, due_date.strftime('%Y-%m-%d'),
+                                                task_description)
+                self.add_task(new_task)
                 st.success(f"✅ Task '{task_title}' added successfully with AI guidance!")
                 st.rerun()
             else:
                 st.error("Please enter a task title!")
         
+        # Bulk import section
+        with st.expander("📥 Bulk Import (CSV / JSON Lines)"):
+            st.caption("Columns: title (required), description, category, priority, due_date (YYYY-MM-DD), "
+                       "created_date and completed_date (YYYY-MM-DD HH:MM) for migrating finished tasks.")
+            upload = st.file_uploader("Tasks file", type=list(IMPORT_FORMATS))
+            if upload is not None and st.button("📥 Import Tasks"):
+                import_format = IMPORT_FORMATS[upload.name.rsplit(".", 1)[-1].lower()]
+                with st.spinner("Importing tasks..."):
+                    st.session_state.last_import = import_tasks(
+                        upload, import_format, self.store, self.rescoring.scorer, self.generate_ai_guidance_batch
+                    )
+                st.rerun()
+            
+            report = st.session_state.get('last_import')
+            if report is not None:
+                st.success(f"✅ Imported {report.imported} of {report.rows} row(s) in {report.seconds:.1f}s "
+                           f"({report.rows_per_second:,.0f} rows/s)")
+                if report.errors:
+                    st.warning(f"⚠️ {len(report.errors)} row(s) were skipped:")
+                    st.table([{"Line": line, "Error": error} for line, error in report.errors[:100]])
+        
         # Display current tasks
         st.subheader("📋 Current Tasks")
         
-        if st.session_state.tasks:
-            # Sort tasks by priority score
-            sorted_tasks = sorted(st.session_state.tasks, key=lambda x: x['priority_score'], reverse=True)
-            
-            for i, task in enumerate(sorted_tasks):
-                with st.expander(f"{'🔴' if task['priority'] == 'High' else '🟡' if task['priority'] == 'Medium' else '🟢'} {task['title']} - {task['category']}", 
-                                expanded=i < 3):  # Expand top 3 priority tasks
-                    
+        # Urgency depends on today's date, so scores are refreshed once per day
+        rescored = self.engine.rescore()
+        if rescored:
+            st.toast(f"🔄 {len(rescored)} task(s) gained urgency as their deadlines got closer")
+        
+        # Filters run as store queries, so only the visible page is ever rendered
+        today = datetime.now().date()
+        due_windows = {
+            "Any time": (None, None),
+            "Overdue": (None, today - timedelta(days=1)),
+            "Due today": (today, today),
+            "Next 7 days": (today, today + timedelta(days=7)),
+            "Next 30 days": (today, today + timedelta(days=30))
+        }
+        
+        search_query = st.text_input("🔍 Search tasks", placeholder="Search titles and descriptions...")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            category_filter = st.multiselect("Filter by category",
+                                             AppConfig.TASK_CATEGORIES)
+        with col2:
+            priority_filter = st.multiselect("Filter by priority", AppConfig.TASK_PRIORITIES)
+        with col3:
+            due_window = st.selectbox("Due", list(due_windows))
+        with col4:
+            page_size = st.selectbox("Tasks per page", AppConfig.TASK_PAGE_SIZE_OPTIONS,
+                                     index=AppConfig.TASK_PAGE_SIZE_OPTIONS.index(AppConfig.TASK_PAGE_SIZE))
+        
+        due_from, due_to = due_windows[due_window]
+        filters = {
+            "categories": category_filter,
+            "priorities": priority_filter,
+            "due_from": due_from.strftime('%Y-%m-%d') if due_from else None,
+            "due_to": due_to.strftime('%Y-%m-%d') if due_to else None
+        }
+        
+        if search_query.strip():
+            # Search results come from the full-text index, ranked by relevance
+            matches = self.store.search_active(search_query, **filters)
+            total = len(matches)
+        else:
+            matches = None
+            total = self.store.count_active(**filters)
+        page_count = max(1, -(-total // page_size))
+        page_number = st.number_input("Page", min_value=1, max_value=page_count, value=1) if page_count > 1 else 1
+        offset = (page_number - 1) * page_size
+        
+        if matches is not None:
+            sorted_tasks = matches[offset:offset + page_size]
+        else:
+            # The store keeps active tasks indexed in priority order, so no sort is needed
+            sorted_tasks = self.store.query_active(**filters, offset=offset, limit=page_size)
+        
+        if sorted_tasks:
+            st.caption(f"Showing {offset + 1}–{offset + len(sorted_tasks)} of {total} task(s)")
+            for i, task in enumerate(sorted_tasks, start=offset):
+                with st.container():
                     col1, col2, col3 = st.columns([3, 1, 1])
                     
                     with col1:
-                        st.write(f"**Priority:** {task['priority']}")
-                        st.write(f"**Due Date:** {task['due_date']}")
+                        # Details and guidance are only rendered for rows that are opened
+                        show_details = st.toggle(
+                            f"{'🔴' if task['priority'] == 'High' else '🟡' if task['priority'] == 'Medium' else '🟢'} {task['title']} - {task['category']}",
+                            value=i < 3,  # Expand top 3 priority tasks
+                            key=f"details_{task['id']}"
+                        )
+                        st.caption(f"Priority: {task['priority']} · Due: {task['due_date']}")
+                    
+                    with col2:
+                        if st.button("✅ Complete", key=f"complete_{task['id']}"):
+                            try:
+                                self.engine.complete_task(task['id'], expected_version=task['version'])
+                            except ConcurrentModificationError:
+                                st.warning(f"⚠️ '{task['title']}' was changed by someone else. Refresh to see the latest.")
+                            else:
+                                st.success(f"Task '{task['title']}' completed! 🎉")
+                                st.rerun()
+                    
+                    with col3:
+                        if st.button("🗑️ Delete", key=f"delete_{task['id']}"):
+                            try:
+                                self.engine.delete_task(task['id'], expected_version=task['version'])
+                            except ConcurrentModificationError:
+                                st.warning(f"⚠️ '{task['title']}' was changed by someone else. Refresh to see the latest.")
+                            else:
+                                st.warning(f"Task '{task['title']}' deleted.")
+                                st.rerun()
+                    
+                    if show_details:
                         if task['description']:
                             st.write(f"**Description:** {task['description']}")
                         
                         # AI Guidance
                         st.markdown("### 🤖 AI Guidance")
                         st.info(task['ai_guidance'])
+                        if self.engine.is_guidance_pending(task['id']):
+                            st.caption("⏳ Model guidance is on its way and will replace this on the next refresh.")
                     
-                    with col2:
-                        if st.button("✅ Complete", key=f"complete_{task['id']}"):
-                            completed_task = task.copy()
-                            completed_task['completed_date'] = datetime.now().strftime('%Y-%m-%d %H:%M')
-                            st.session_state.completed_tasks.append(completed_task)
-                            st.session_state.tasks.remove(task)
-                            st.success(f"Task '{task['title']}' completed! 🎉")
-                            st.rerun()
-                    
-                    with col3:
-                        if st.button("🗑️ Delete", key=f"delete_{task['id']}"):
-                            st.session_state.tasks.remove(task)
-                            st.warning(f"Task '{task['title']}' deleted.")
-                            st.rerun()
+                    st.divider()
+        elif total == 0 and (search_query.strip() or any(filters.values())):
+            st.info("No active tasks match these filters.")
         else:
             st.info("No active tasks. Add a new task to get started! 🚀")
 
+    @perf.timed("page.ai_insights")
     def ai_insights_page(self):
         st.header("🧠 AI Insights & Recommendations")
         
-        insights = self.get_productivity_insights(st.session_state.tasks, st.session_state.completed_tasks)
+        insights = self.get_productivity_insights()
         
         # Daily motivation
         st.subheader("💪 Daily Motivation")
@@ -273,40 +471,24 @@ class AIToDoApp:
         # AI Task Suggestions
         st.subheader("🤖 AI Task Suggestions")
         
-        suggestion_categories = [
-            ("Health & Wellness", ["Take a 10-minute walk", "Drink 8 glasses of water today", "Practice 5 minutes of meditation"]),
-            ("Professional Growth", ["Update your LinkedIn profile", "Read one industry article", "Network with one colleague"]),
-            ("Personal Development", ["Learn something new for 15 minutes", "Practice a hobby", "Call a friend or family member"]),
-            ("Organization", ["Declutter your workspace", "Review your goals", "Plan tomorrow's priorities"])
-        ]
-        
-        selected_category = st.selectbox("Choose suggestion category:", [cat[0] for cat in suggestion_categories])
-        
-        for cat_name, suggestions in suggestion_categories:
-            if cat_name == selected_category:
-                suggested_task = random.choice(suggestions)
-                st.success(f"💡 **Suggested Task:** {suggested_task}")
-                
-                if st.button("➕ Add Suggested Task"):
-                    new_task = {
-                        "id": len(st.session_state.tasks) + len(st.session_state.completed_tasks) + 1,
-                        "title": suggested_task,
-                        "description": "AI-suggested task for personal growth",
-                        "category": "Personal",
-                        "priority": "Medium",
-                        "due_date": (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d'),
-                        "created_date": datetime.now().strftime('%Y-%m-%d %H:%M'),
-                        "priority_score": 6.0,
-                        "ai_guidance": self.generate_ai_guidance(suggested_task, "Medium", "Personal")
-                    }
-                    st.session_state.tasks.append(new_task)
-                    st.success("✅ Suggested task added to your list!")
-                    st.rerun()
+        selected_category = st.selectbox("Choose suggestion category:", list(SUGGESTION_CATEGORIES))
+        
+        suggested_task = random.choice(SUGGESTION_CATEGORIES[selected_category])
+        st.success(f"💡 **Suggested Task:** {suggested_task}")
+        
+        if st.button("➕ Add Suggested Task"):
+            new_task = self.engine.new_task(suggested_task, AppConfig.DEFAULT_CATEGORY, "Medium",
+                                            (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d'),
+                                            "AI-suggested task for personal growth")
+            self.add_task(new_task)
+            st.success("✅ Suggested task added to your list!")
+            st.rerun()
 
+    @perf.timed("page.analytics")
     def analytics_page(self):
         st.header("📊 Analytics Dashboard")
         
-        insights = self.get_productivity_insights(st.session_state.tasks, st.session_state.completed_tasks)
+        insights = self.get_productivity_insights()
         
         # Key metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -329,83 +511,136 @@ class AIToDoApp:
         with col1:
             st.subheader("📊 Tasks by Category")
             if insights['category_distribution']:
-                fig_category = px.pie(
-                    values=list(insights['category_distribution'].values()),
-                    names=list(insights['category_distribution'].keys()),
-                    title="Task Distribution by Category"
+                fig_category = self.cached_figure(
+                    ("category",), lambda: self.build_category_figure(insights['category_distribution'])
                 )
-                st.plotly_chart(fig_category, use_container_width=True)
+                with perf.span("figure.render"):
+                    st.plotly_chart(fig_category, use_container_width=True)
             else:
                 st.info("No task data available for category analysis.")
         
         with col2:
             st.subheader("⚡ Tasks by Priority")
             if insights['priority_distribution']:
-                colors = {'High': '#FF6B6B', 'Medium': '#FFE66D', 'Low': '#4ECDC4'}
-                fig_priority = px.bar(
-                    x=list(insights['priority_distribution'].keys()),
-                    y=list(insights['priority_distribution'].values()),
-                    title="Task Distribution by Priority",
-                    color=list(insights['priority_distribution'].keys()),
-                    color_discrete_map=colors
+                fig_priority = self.cached_figure(
+                    ("priority",), lambda: self.build_priority_figure(insights['priority_distribution'])
                 )
-                st.plotly_chart(fig_priority, use_container_width=True)
+                with perf.span("figure.render"):
+                    st.plotly_chart(fig_priority, use_container_width=True)
             else:
                 st.info("No task data available for priority analysis.")
         
-        # Productivity timeline (mock data for demonstration)
+        # Productivity timeline from the task event log
         st.subheader("📈 Productivity Timeline")
         
-        # Generate sample productivity data
-        dates = pd.date_range(start=datetime.now() - timedelta(days=30), end=datetime.now(), freq='D')
-        productivity_data = pd.DataFrame({
-            'Date': dates,
-            'Tasks_Completed': [random.randint(0, 5) for _ in dates],
-            'Tasks_Added': [random.randint(0, 3) for _ in dates]
-        })
-        
-        fig_timeline = go.Figure()
-        fig_timeline.add_trace(go.Scatter(
-            x=productivity_data['Date'],
-            y=productivity_data['Tasks_Completed'],
-            mode='lines+markers',
-            name='Tasks Completed',
-            line=dict(color='green')
-        ))
-        fig_timeline.add_trace(go.Scatter(
-            x=productivity_data['Date'],
-            y=productivity_data['Tasks_Added'],
-            mode='lines+markers',
-            name='Tasks Added',
-            line=dict(color='blue')
-        ))
+        today = datetime.now().date()
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            default_range = (today - timedelta(days=30), today)
+            date_range = st.date_input("Date range", value=default_range, max_value=today)
+        with col2:
+            period = st.radio("Group by", ["Daily", "Weekly", "Monthly"], horizontal=True)
         
-        fig_timeline.update_layout(
-            title='30-Day Productivity Overview',
-            xaxis_title='Date',
-            yaxis_title='Number of Tasks',
-            hovermode='x unified'
+        # The range picker returns one date while the user is still choosing the end, and none once cleared
+        if len(date_range) == 2:
+            start_date, end_date = date_range
+        elif date_range:
+            start_date = end_date = date_range[0]
+        else:
+            start_date, end_date = default_range
+        grain = {"Daily": "day", "Weekly": "week", "Monthly": "month"}[period]
+        
+        # Long ranges switch to a coarser grain so the chart stays within TIMELINE_MAX_POINTS
+        max_points = AppConfig.TIMELINE_MAX_POINTS
+        chart_grain = timeline.fit_grain(grain, start_date, end_date, max_points)
+        if chart_grain != grain:
+            period = {"week": "Weekly", "month": "Monthly"}[chart_grain]
+            st.caption(f"Showing {period.lower()} totals to keep the chart under {max_points} points.")
+        
+        fig_timeline = self.cached_figure(
+            ("timeline", chart_grain, start_date, end_date),
+            lambda: self.build_timeline_figure(
+                timeline.downsample(self.store.timeline(chart_grain, start_date, end_date), max_points), period
+            )
         )
         
-        st.plotly_chart(fig_timeline, use_container_width=True)
+        with perf.span("figure.render"):
+            st.plotly_chart(fig_timeline, use_container_width=True)
         
         # Export options
         st.subheader("💾 Export Data")
         
-        if st.button("📥 Export Tasks to CSV"):
-            all_tasks_data = st.session_state.tasks + st.session_state.completed_tasks
-            if all_tasks_data:
-                df = pd.DataFrame(all_tasks_data)
-                csv = df.to_csv(index=False)
-                st.download_button(
-                    label="Download CSV",
-                    data=csv,
-                    file_name=f"tasks_export_{datetime.now().strftime('%Y%m%d')}.csv",
-                    mime="text/csv"
-                )
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            export_format = st.selectbox("Format", available_formats())
+            compress = st.checkbox("Compress (gzip)")
+        with col2:
+            export_state = st.radio("Tasks", ["All", "Active", "Completed"], horizontal=True)
+            export_categories = st.multiselect("Categories",
+                                               AppConfig.TASK_CATEGORIES,
+                                               key="export_categories")
+        with col3:
+            created_range = st.date_input("Created between", value=(), key="export_created_range")
+        
+        if st.button("📥 Export Tasks"):
+            chunks = self.store.iter_task_chunks(
+                completed={"All": None, "Active": False, "Completed": True}[export_state],
+                categories=export_categories,
+                created_from=created_range[0].strftime('%Y-%m-%d') if created_range else None,
+                created_to=created_range[-1].strftime('%Y-%m-%d') if created_range else None,
+                chunk_rows=EXPORT_CHUNK_ROWS
+            )
+            first_chunk = next(chunks, None)
+            if first_chunk:
+                # Rows are streamed to a temp file chunk by chunk instead of building a DataFrame
+                with perf.span("export"):
+                    path = export_tasks(itertools.chain([first_chunk], chunks), export_format, compress)
+                with open(path, "rb") as export_file:
+                    st.download_button(
+                        label=f"Download {export_format}",
+                        data=export_file,
+                        file_name=export_file_name(export_format, compress, datetime.now().strftime('%Y%m%d')),
+                        mime="application/gzip" if compress and export_format != "Parquet"
+                        else EXPORT_FORMATS[export_format]["mime"]
+                    )
+                os.remove(path)
             else:
                 st.warning("No tasks to export.")
 
+    def performance_page(self):
+        st.header("⏱️ Performance")
+        st.markdown("*Rolling timings of instrumented spans in this server process*")
+        
+        perf.enabled = st.toggle("Collect timings", value=perf.enabled)
+        
+        summary = perf.summary()
+        if summary:
+            st.table([
+                {
+                    "Span": row['span'],
+                    "Count": row['count'],
+                    "Mean (ms)": f"{row['mean_ms']:.2f}",
+                    "p50 (ms)": f"{row['p50_ms']:.2f}",
+                    "p95 (ms)": f"{row['p95_ms']:.2f}",
+                    "p99 (ms)": f"{row['p99_ms']:.2f}"
+                }
+                for row in summary
+            ])
+        else:
+            st.info("No timings recorded yet. Use the other pages and come back.")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("📄 Write Prometheus Snapshot"):
+                path = perf.write_prometheus(AppConfig.METRICS_SNAPSHOT_PATH)
+                st.success(f"Snapshot written to {path}")
+                st.download_button("Download snapshot", data=perf.to_prometheus(),
+                                   file_name="metrics.prom", mime="text/plain")
+        with col2:
+            if st.button("🔄 Reset Timings"):
+                perf.reset()
+                st.rerun()
+
 # Run the app
 if __name__ == "__main__":
     app = AIToDoApp()
@@ -0,0 +1,113 @@
+import gzip
+import json
+import os
+import sqlite3
+from typing import Dict, Iterator, List, Optional
+
+# Completed tasks are moved out of the live table in segments of at most this many rows
+SEGMENT_ROWS = 50_000
+
+
+def archive_directory(database_path: str) -> str:
+    """Directory holding a store's archive segments, next to its database"""
+    return f"{os.path.splitext(database_path)[0]}-archive"
+
+
+def segment_file_name(tasks: List[Dict]) -> str:
+    # Task ids are never reused, so the id range names a segment uniquely
+    return f"segment-{tasks[0]['id']:09d}-{tasks[-1]['id']:09d}.jsonl.gz"
+
+
+def write_segment(directory: str, tasks: List[Dict]) -> Dict:
+    """Write tasks to a new gzipped JSON Lines segment and return its manifest entry
+
+    The file is written under a temporary name, synced and then renamed, so a
+    segment is either complete or absent.
+    """
+    os.makedirs(directory, exist_ok=True)
+    file_name = segment_file_name(tasks)
+    path = os.path.join(directory, file_name)
+    with open(f"{path}.tmp", "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as handle:
+            handle.write("".join(json.dumps(task, ensure_ascii=False) + "\n" for task in tasks).encode("utf-8"))
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(f"{path}.tmp", path)
+
+    created = sorted(task["created_date"] for task in tasks)
+    completed = sorted(task["completed_date"] for task in tasks)
+    return {
+        "file_name": file_name,
+        "rows": len(tasks),
+        "created_from": created[0],
+        "created_to": created[-1],
+        "completed_from": completed[0],
+        "completed_to": completed[-1]
+    }
+
+
+def record_segment(conn: sqlite3.Connection, segment: Dict, tasks: List[Dict], archived_at: str):
+    """Add a segment to the manifest and fold its tasks into the archived counts
+
+    Runs inside the caller's transaction, together with removing the tasks from
+    the live table, so a task is always either live or archived.
+    """
+    conn.execute(
+        "INSERT INTO archive_segments (file_name, rows, created_from, created_to, completed_from, "
+        "completed_to, archived_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (segment["file_name"], segment["rows"], segment["created_from"], segment["created_to"],
+         segment["completed_from"], segment["completed_to"], archived_at)
+    )
+    counts: Dict = {}
+    for task in tasks:
+        key = (task["category"], task["priority"])
+        counts[key] = counts.get(key, 0) + 1
+    conn.executemany(
+        "INSERT INTO archived_counts (category, priority, count) VALUES (?, ?, ?) "
+        "ON CONFLICT (category, priority) DO UPDATE SET count = count + excluded.count",
+        [(category, priority, count) for (category, priority), count in counts.items()]
+    )
+
+
+def read_segment(path: str) -> Iterator[Dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            yield json.loads(line)
+
+
+def iter_archived_chunks(conn: sqlite3.Connection, directory: str,
+                         categories: Optional[List[str]] = None,
+                         created_from: Optional[str] = None, created_to: Optional[str] = None,
+                         chunk_rows: int = 10_000) -> Iterator[List[Dict]]:
+    """Stream archived tasks matching the filters, reading only the segments whose
+    created range overlaps the requested one"""
+    conditions, params = [], []
+    if created_from:
+        conditions.append("created_to >= ?")
+        params.append(created_from)
+    if created_to:
+        conditions.append("created_from <= ?")
+        params.append(created_to)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    file_names = [row[0] for row in conn.execute(
+        f"SELECT file_name FROM archive_segments {where} ORDER BY id", params
+    ).fetchall()]
+
+    chunk = []
+    for file_name in file_names:
+        for task in read_segment(os.path.join(directory, file_name)):
+            if ((categories and task["category"] not in categories)
+                    or (created_from and task["created_date"] < created_from)
+                    or (created_to and task["created_date"] > created_to)):
+                continue
+            chunk.append(task)
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def archived_counts(conn: sqlite3.Connection) -> List[tuple]:
+    """(category, priority, count) of every archived task"""
+    return conn.execute("SELECT category, priority, count FROM archived_counts").fetchall()
@@ -0,0 +1,231 @@
+"""Benchmarks for the app's hot paths over synthetic task sets
+
+    python -m benchmarks.run_benchmarks --sizes 1000,10000 --output bench.json
+    python -m benchmarks.run_benchmarks --baseline benchmarks/baseline.json
+
+Each case reports best-of-N wall time, peak traced memory and the number of
+memory blocks it allocated that are still alive when it returns, counted from
+a tracemalloc snapshot. With --baseline, cases that got slower or bigger than
+the threshold are listed and the exit status is 1.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import date, datetime
+from typing import Callable, Dict, List
+
+from benchmarks.synthetic import generate_tasks
+from config import AppConfig
+from export import EXPORT_CHUNK_ROWS, export_tasks
+from guidance import GuidanceEngine
+from insights import InsightsAggregator
+from scoring import PriorityScorer
+from task_collection import TaskCollection
+from task_store import TaskStore
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+TODAY = "2026-01-01"
+
+# Differences below this many seconds are treated as noise when comparing to a baseline
+NOISE_FLOOR_SECONDS = 0.001
+
+
+def build_cases(tasks: List[Dict], cleanup: ExitStack) -> Dict[str, Callable[[], Callable]]:
+    """The hot paths to time, closed over one synthetic task set
+
+    Each case is a setup function that returns the callable to time, so setup
+    only runs for the selected cases and is never part of the measurement.
+    Resources it opens are released through `cleanup`.
+    """
+    active = [task for task in tasks if "completed_date" not in task]
+    completed = [task for task in tasks if "completed_date" in task]
+    today = date.fromisoformat(TODAY)
+    scorer = PriorityScorer()
+
+    def score_each():
+        days_until_due = [(date.fromisoformat(task["due_date"]) - today).days for task in active]
+        return lambda: [scorer.score(task["priority"], days, task["category"])
+                        for task, days in zip(active, days_until_due)]
+
+    def guidance():
+        def run():
+            engine = GuidanceEngine.from_file(AppConfig.GUIDANCE_DATA_PATH, seed=0,
+                                              cache_size=AppConfig.GUIDANCE_CACHE_SIZE)
+            return engine.generate_many([(task["title"], task["priority"], task["category"]) for task in tasks])
+        return run
+
+    def insights():
+        # The app reads insights from the store's incrementally maintained counters
+        directory = tempfile.mkdtemp(prefix="bench-store-")
+        cleanup.callback(shutil.rmtree, directory, ignore_errors=True)
+        store = TaskStore(os.path.join(directory, "tasks.db"))
+        cleanup.callback(store.close)
+        store.add_tasks(tasks)
+        return lambda: store.insights(TODAY)
+
+    def insights_rebuild():
+        return lambda: InsightsAggregator.from_tasks(active, completed).snapshot(TODAY)
+
+    def build_collection():
+        def run():
+            fresh = TaskCollection()
+            for task in active:
+                fresh.add(task)
+            return fresh
+        return run
+
+    def bulk_load_collection():
+        def run():
+            fresh = TaskCollection()
+            fresh.extend(active)
+            return fresh
+        return run
+
+    def ranked_page():
+        collection = TaskCollection()
+        collection.extend(dict(task) for task in active)
+        return lambda: collection.ranked(0, AppConfig.TASK_PAGE_SIZE)
+
+    def csv_export():
+        def run():
+            chunks = (tasks[start:start + EXPORT_CHUNK_ROWS] for start in range(0, len(tasks), EXPORT_CHUNK_ROWS))
+            path = export_tasks(chunks, "CSV")
+            size = os.path.getsize(path)
+            os.remove(path)
+            return size
+        return run
+
+    return {
+        "calculate_priority_score": score_each,
+        "calculate_priority_score_vectorized": lambda: lambda: scorer.score_tasks(active, TODAY),
+        "generate_ai_guidance": guidance,
+        "get_productivity_insights": insights,
+        "insights_full_rebuild": insights_rebuild,
+        "task_manager_sort_legacy": lambda: lambda: sorted(active, key=lambda x: x["priority_score"], reverse=True),
+        "task_manager_collection_build": build_collection,
+        "task_manager_collection_bulk_load": bulk_load_collection,
+        "task_manager_ranked_page": ranked_page,
+        "csv_export": csv_export
+    }
+
+
+def measure(case: Callable, repeat: int) -> Dict:
+    """Best-of-`repeat` wall time, then one traced run for memory"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        case()
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    result = case()
+    peak = tracemalloc.get_traced_memory()[1]
+    # Only blocks allocated while tracing are in the snapshot; ones freed before
+    # the case returned cannot be counted
+    snapshot = tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+    tracemalloc.stop()
+    del result
+
+    return {
+        "wall_seconds": min(timings),
+        "mean_seconds": sum(timings) / len(timings),
+        "peak_bytes": peak,
+        "allocated_blocks": sum(stat.count for stat in snapshot.statistics("filename"))
+    }
+
+
+def run(sizes: List[int], seed: int, repeat: int, only: List[str]) -> Dict:
+    results = []
+    for size in sizes:
+        tasks = generate_tasks(size, seed=seed)
+        with ExitStack() as cleanup:
+            for name, setup in build_cases(tasks, cleanup).items():
+                if only and name not in only:
+                    continue
+                stats = measure(setup(), repeat)
+                results.append({"case": name, "size": size, **stats})
+                print(f"{name:<38} {size:>9,}  {stats['wall_seconds'] * 1000:>10.2f} ms  "
+                      f"{stats['peak_bytes'] / 2 ** 20:>9.1f} MiB peak", flush=True)
+        del tasks
+        gc.collect()
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "created": datetime.now().isoformat(timespec="seconds")
+        },
+        "results": results
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Describe every case that regressed by more than `threshold` against the baseline"""
+    previous = {(result["case"], result["size"]): result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        before = previous.get((result["case"], result["size"]))
+        if before is None:
+            continue
+        wall, old_wall = result["wall_seconds"], before["wall_seconds"]
+        if wall > old_wall * (1 + threshold) and wall - old_wall > NOISE_FLOOR_SECONDS:
+            regressions.append(f"{result['case']} @ {result['size']:,}: "
+                               f"{old_wall * 1000:.2f} ms -> {wall * 1000:.2f} ms")
+        peak, old_peak = result["peak_bytes"], before["peak_bytes"]
+        if peak > old_peak * (1 + threshold) and peak - old_peak > 2 ** 20:
+            regressions.append(f"{result['case']} @ {result['size']:,}: "
+                               f"{old_peak / 2 ** 20:.1f} MiB -> {peak / 2 ** 20:.1f} MiB peak")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="comma-separated task counts")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", default="", help="comma-separated case names to run (default: all)")
+    parser.add_argument("--output", default=os.path.join(tempfile.gettempdir(), "benchmark_results.json"))
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, e.g. 0.25 for 25%%")
+    parser.add_argument("--update-baseline", action="store_true", help="write these results to --baseline")
+    args = parser.parse_args()
+
+    results = run([int(size) for size in args.sizes.split(",")], args.seed, args.repeat,
+                  [name for name in args.cases.split(",") if name])
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2)
+    print(f"Results written to {args.output}")
+
+    if not args.baseline:
+        return
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    with open(args.baseline, encoding="utf-8") as handle:
+        regressions = compare(results, json.load(handle), args.threshold)
+    if regressions:
+        print("Regressions against baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
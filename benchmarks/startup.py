@@ -0,0 +1,88 @@
+"""Cold-start benchmark for the Streamlit app
+
+    python -m benchmarks.startup --runs 5 --output startup.json
+
+Every run starts a fresh interpreter against an empty database and measures how
+long `import app` takes once Streamlit itself is loaded, and how long the first
+Task Manager render takes through Streamlit's AppTest harness. It also records
+which heavy libraries were loaded by then.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from typing import Dict, List
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["pandas", "numpy", "plotly.express", "plotly.graph_objects", "pyarrow"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import streamlit
+from streamlit.testing.v1 import AppTest
+streamlit_loaded = time.perf_counter()
+import app
+app_imported = time.perf_counter()
+loaded_by_import = [name for name in {heavy!r} if name in sys.modules]
+AppTest.from_file({script!r}, default_timeout=300).run()
+rendered = time.perf_counter()
+print(json.dumps({{
+    "import_streamlit_seconds": streamlit_loaded - started,
+    "import_app_seconds": app_imported - streamlit_loaded,
+    "first_render_seconds": rendered - app_imported,
+    "heavy_modules_after_import": loaded_by_import,
+    "heavy_modules_after_render": [name for name in {heavy!r} if name in sys.modules]
+}}))
+"""
+
+
+def run_once() -> Dict:
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = {**os.environ, "TASKS_DB_PATH": os.path.join(data_dir, "tasks.db")}
+        probe = PROBE.format(heavy=HEAVY_MODULES, script=os.path.join(APP_DIR, "app.py"))
+        completed = subprocess.run([sys.executable, "-c", probe], cwd=APP_DIR, env=env,
+                                   capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs: List[Dict]) -> Dict:
+    summary = {}
+    for key in ("import_streamlit_seconds", "import_app_seconds", "first_render_seconds"):
+        values = [run[key] for run in runs]
+        summary[key] = {"median": statistics.median(values), "min": min(values), "max": max(values)}
+    summary["heavy_modules_after_import"] = runs[-1]["heavy_modules_after_import"]
+    summary["heavy_modules_after_render"] = runs[-1]["heavy_modules_after_render"]
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs,
+            "created": datetime.now().isoformat(timespec="seconds")
+        },
+        "summary": summarize(runs),
+        "runs": runs
+    }
+    print(json.dumps(results["summary"], indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
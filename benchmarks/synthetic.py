@@ -0,0 +1,41 @@
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+from config import AppConfig
+
+TITLE_VERBS = ["Write", "Review", "Plan", "Update", "Call", "Fix", "Prepare", "Read", "Clean", "Schedule"]
+TITLE_OBJECTS = ["report", "budget", "presentation", "workout", "course notes", "invoice", "garden",
+                 "newsletter", "dentist visit", "quarterly goals", "backlog", "tax return"]
+
+GUIDANCE_TEXT = ("📋 **Balanced Approach**: This task is important but manageable. Schedule it during your "
+                 "moderately productive hours.\n\n🎯 Define clear success criteria and next steps.")
+
+
+def iter_tasks(count: int, seed: int = 42, completed_ratio: float = 0.3,
+               now: datetime = datetime(2026, 1, 1, 9, 0)) -> Iterator[Dict]:
+    """Yield `count` reproducible task dicts with the same schema as the app's tasks"""
+    rng = random.Random(seed)
+    for task_id in range(1, count + 1):
+        created = now - timedelta(days=rng.randint(0, 730), minutes=rng.randint(0, 1439))
+        priority = rng.choice(AppConfig.TASK_PRIORITIES)
+        category = rng.choice(AppConfig.TASK_CATEGORIES)
+        task = {
+            "id": task_id,
+            "title": f"{rng.choice(TITLE_VERBS)} {rng.choice(TITLE_OBJECTS)} #{task_id}",
+            "description": "" if rng.random() < 0.5 else "Generated for benchmarking",
+            "category": category,
+            "priority": priority,
+            "due_date": (created + timedelta(days=rng.randint(0, 60))).strftime('%Y-%m-%d'),
+            "created_date": created.strftime('%Y-%m-%d %H:%M'),
+            "priority_score": 6.0,
+            "ai_guidance": GUIDANCE_TEXT
+        }
+        if rng.random() < completed_ratio:
+            completed = created + timedelta(days=rng.randint(0, 30), minutes=rng.randint(0, 600))
+            task["completed_date"] = completed.strftime('%Y-%m-%d %H:%M')
+        yield task
+
+
+def generate_tasks(count: int, seed: int = 42, completed_ratio: float = 0.3) -> List[Dict]:
+    return list(iter_tasks(count, seed, completed_ratio))
@@ -1,5 +1,32 @@
+import json
 import os
 from dataclasses import dataclass
+from typing import Dict, List
+
+_DEFAULT_GUIDANCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "guidance.json")
+
+
+def _read_guidance_data(path: str) -> Dict:
+    """The guidance data file's contents, or an empty dict if it cannot be read"""
+    try:
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _guidance_categories(path: str, fallback: List[str]) -> List[str]:
+    """Task categories defined by the guidance data file, in file order"""
+    tips = _read_guidance_data(path).get("category_tips")
+    return list(tips) if isinstance(tips, dict) and tips else fallback
+
+
+def _default_category(path: str, categories: List[str]) -> str:
+    """The guidance data file's default_category, or the last known category"""
+    category = _read_guidance_data(path).get("default_category")
+    return category if category in categories else categories[-1]
+
 
 @dataclass
 class AppConfig:
@@ -37,6 +64,54 @@ class AppConfig:
         "error_red": "#dc2626"
     }
     
+    # Guidance templates and tips
+    GUIDANCE_DATA_PATH = os.getenv("GUIDANCE_DATA_PATH", _DEFAULT_GUIDANCE_PATH)
+    GUIDANCE_SEED = int(os.environ["GUIDANCE_SEED"]) if os.getenv("GUIDANCE_SEED") else None
+    GUIDANCE_CACHE_SIZE = 4096
+    
+    # Task fields; categories are the ones the guidance data has tips for
+    TASK_CATEGORIES = _guidance_categories(
+        GUIDANCE_DATA_PATH, ["Work", "Personal", "Health", "Learning", "Finance", "Other"]
+    )
+    # Category given to tasks that do not name one
+    DEFAULT_CATEGORY = _default_category(GUIDANCE_DATA_PATH, TASK_CATEGORIES)
+    TASK_PRIORITIES = ["High", "Medium", "Low"]
+    
+    # Task list pagination
+    TASK_PAGE_SIZE = 25
+    TASK_PAGE_SIZE_OPTIONS = [10, 25, 50, 100]
+    
+    # Guidance backend: "template" or "http" (model output from LLM_GUIDANCE_URL)
+    GUIDANCE_BACKEND = os.getenv("GUIDANCE_BACKEND", "template").lower()
+    LLM_GUIDANCE_URL = os.getenv("LLM_GUIDANCE_URL", "http://127.0.0.1:8765/v1/guidance")
+    LLM_WORKERS = int(os.getenv("LLM_WORKERS", 4))
+    LLM_QUEUE_SIZE = 1000
+    LLM_BATCH_SIZE = 16
+    LLM_BATCH_WAIT = 0.05
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 10.0))
+    LLM_RETRIES = 2
+    
+    # Analytics charts
+    FIGURE_CACHE_SIZE = 64
+    TIMELINE_MAX_POINTS = 366
+    
+    # Performance instrumentation
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+    METRICS_WINDOW = 1000
+    METRICS_SNAPSHOT_PATH = os.getenv("METRICS_SNAPSHOT_PATH", "metrics.prom")
+    SHOW_PERFORMANCE_PAGE = os.getenv("SHOW_PERFORMANCE_PAGE", "False").lower() == "true"
+    
+    # Storage
+    DATABASE_PATH = os.getenv("TASKS_DB_PATH", "tasks.db")
+    
+    # Shared workspaces: the default one lives at DATABASE_PATH, the others in WORKSPACE_DIR
+    DEFAULT_WORKSPACE = os.getenv("DEFAULT_WORKSPACE", "default")
+    WORKSPACE_DIR = os.getenv("WORKSPACE_DIR", "workspaces")
+    MAX_OPEN_WORKSPACES = int(os.getenv("MAX_OPEN_WORKSPACES", 32))
+    
+    # Completed tasks older than this many days move to compressed archive segments (0 disables)
+    ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", 90))
+    
     # Environment settings
     DEBUG = os.getenv("DEBUG", "False").lower() == "true"
     PORT = int(os.getenv("PORT", 8501))
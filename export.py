@@ -0,0 +1,80 @@
+import csv
+import gzip
+import importlib.util
+import json
+import os
+import tempfile
+from typing import Dict, Iterator, List, Optional
+
+from task_store import TASK_COLUMNS
+
+# Rows fetched from the database and written out per chunk
+EXPORT_CHUNK_ROWS = 10_000
+
+EXPORT_FORMATS = {
+    "CSV": {"extension": "csv", "mime": "text/csv"},
+    "JSON Lines": {"extension": "jsonl", "mime": "application/x-ndjson"},
+    "Parquet": {"extension": "parquet", "mime": "application/vnd.apache.parquet"}
+}
+
+
+def parquet_available() -> bool:
+    """Parquet export needs the optional pyarrow package"""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def available_formats() -> List[str]:
+    return [name for name in EXPORT_FORMATS if name != "Parquet" or parquet_available()]
+
+
+def export_file_name(fmt: str, compress: bool, stamp: str) -> str:
+    extension = EXPORT_FORMATS[fmt]["extension"]
+    # Parquet compresses column chunks internally instead of gzipping the whole file
+    suffix = ".gz" if compress and fmt != "Parquet" else ""
+    return f"tasks_export_{stamp}.{extension}{suffix}"
+
+
+def export_tasks(chunks: Iterator[List[Dict]], fmt: str, compress: bool = False,
+                 path: Optional[str] = None) -> str:
+    """Write task chunks to a file one chunk at a time and return its path"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}")
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=f".{EXPORT_FORMATS[fmt]['extension']}")
+        os.close(fd)
+
+    if fmt == "Parquet":
+        _write_parquet(chunks, path, compress)
+    else:
+        opener = gzip.open if compress else open
+        with opener(path, "wt", encoding="utf-8", newline="") as handle:
+            if fmt == "CSV":
+                _write_csv(chunks, handle)
+            else:
+                _write_jsonl(chunks, handle)
+    return path
+
+
+def _write_csv(chunks: Iterator[List[Dict]], handle):
+    writer = csv.DictWriter(handle, fieldnames=TASK_COLUMNS)
+    writer.writeheader()
+    for chunk in chunks:
+        writer.writerows(chunk)
+
+
+def _write_jsonl(chunks: Iterator[List[Dict]], handle):
+    for chunk in chunks:
+        handle.write("".join(json.dumps(task, ensure_ascii=False) + "\n" for task in chunk))
+
+
+def _write_parquet(chunks: Iterator[List[Dict]], path: str, compress: bool):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        (column, pa.int64() if column == "id" else pa.float64() if column == "priority_score" else pa.string())
+        for column in TASK_COLUMNS
+    ])
+    with pq.ParquetWriter(path, schema, compression="gzip" if compress else "snappy") as writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
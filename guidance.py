@@ -0,0 +1,73 @@
+import json
+import random
+from string import Formatter
+from typing import Dict, List, Optional, Tuple
+
+from cache import LRUCache
+
+# Placeholders a template may use
+TEMPLATE_FIELDS = {"title", "category", "category_lower"}
+
+# A compiled template: literal text followed by the field to substitute (None at the end)
+CompiledTemplate = List[Tuple[str, Optional[str]]]
+
+
+def compile_template(template: str) -> CompiledTemplate:
+    """Split a template into literal/field pairs once so rendering is a plain join"""
+    parts = []
+    for literal, field_name, format_spec, conversion in Formatter().parse(template):
+        if field_name is not None and field_name not in TEMPLATE_FIELDS:
+            raise ValueError(f"Unknown guidance placeholder {{{field_name}}} in {template!r}")
+        if format_spec or conversion:
+            raise ValueError(f"Guidance placeholders cannot use format specs: {template!r}")
+        parts.append((literal, field_name))
+    return parts
+
+
+class GuidanceEngine:
+    """Template-based task guidance loaded from a data file
+
+    Templates are compiled once, choices come from a seedable RNG, and results
+    are memoized per (title, priority, category) in a bounded LRU cache.
+    """
+
+    def __init__(self, data: Dict, seed: Optional[int] = None, cache_size: int = 4096):
+        self.default_priority = data["default_priority"]
+        self.default_category = data["default_category"]
+        self.templates = {
+            priority: [compile_template(template) for template in templates]
+            for priority, templates in data["templates"].items()
+        }
+        self.category_tips = dict(data["category_tips"])
+        if self.default_priority not in self.templates or self.default_category not in self.category_tips:
+            raise ValueError("Guidance data must define templates and tips for its defaults")
+        self._random = random.Random(seed)
+        self._cache = LRUCache(cache_size)
+
+    @classmethod
+    def from_file(cls, path: str, seed: Optional[int] = None, cache_size: int = 4096) -> "GuidanceEngine":
+        with open(path, encoding="utf-8") as handle:
+            return cls(json.load(handle), seed=seed, cache_size=cache_size)
+
+    def generate(self, task_title: str, priority: str, category: str) -> str:
+        """Guidance text for one task"""
+        key = (task_title, priority, category)
+        guidance = self._cache.get(key)
+        if guidance is None:
+            guidance = self._render(task_title, priority, category)
+            self._cache.put(key, guidance)
+        return guidance
+
+    def generate_many(self, items: List[Tuple[str, str, str]]) -> List[str]:
+        """Guidance for many (title, priority, category) tuples in one call"""
+        return [self.generate(*item) for item in items]
+
+    def _render(self, task_title: str, priority: str, category: str) -> str:
+        templates = self.templates.get(priority) or self.templates[self.default_priority]
+        values = {"title": task_title, "category": category, "category_lower": category.lower()}
+        base_guidance = "".join(
+            literal + (values[field_name] if field_name else "")
+            for literal, field_name in self._random.choice(templates)
+        )
+        category_tip = self.category_tips.get(category, self.category_tips[self.default_category])
+        return f"{base_guidance}\n\n{category_tip}"
@@ -0,0 +1,212 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from cache import LRUCache
+from guidance import GuidanceEngine
+
+logger = logging.getLogger(__name__)
+
+# (title, priority, category)
+GuidanceRequest = Tuple[str, str, str]
+# Called with the key a request was submitted under, e.g. (workspace, task_id), and the guidance
+GuidanceCallback = Callable[[Hashable, str], None]
+
+
+class GuidanceBackend:
+    """Interface for producing task guidance
+
+    `generate` must return immediately. Backends that can improve on that first
+    answer do so through `submit`, calling `on_result` later from another thread.
+    """
+
+    def generate(self, task_title: str, priority: str, category: str) -> str:
+        raise NotImplementedError
+
+    def generate_many(self, items: List[GuidanceRequest]) -> List[str]:
+        return [self.generate(*item) for item in items]
+
+    def submit(self, key: Hashable, item: GuidanceRequest, on_result: GuidanceCallback) -> bool:
+        """Ask for refined guidance under `key`; returns False if none will be delivered"""
+        return False
+
+    def is_pending(self, key: Hashable) -> bool:
+        return False
+
+    def close(self):
+        pass
+
+
+class TemplateGuidanceBackend(GuidanceBackend):
+    """Guidance picked from the template engine"""
+
+    def __init__(self, engine: GuidanceEngine):
+        self.engine = engine
+
+    def generate(self, task_title: str, priority: str, category: str) -> str:
+        return self.engine.generate(task_title, priority, category)
+
+    def generate_many(self, items: List[GuidanceRequest]) -> List[str]:
+        return self.engine.generate_many(items)
+
+
+class HTTPGuidanceBackend(GuidanceBackend):
+    """Model-generated guidance fetched from an HTTP endpoint by an asyncio worker pool
+
+    Requests are posted as {"tasks": [{"title", "priority", "category"}, ...]} and the
+    endpoint answers {"guidance": [...]} in the same order. The pool runs its own
+    event loop on a daemon thread: callers enqueue work into a bounded queue, workers
+    group queued requests into batches, and every call has a timeout and a few retries.
+    Until a model answer arrives, `generate` returns the fallback backend's guidance.
+    Results are handed to `on_result` on a separate callback thread, so slow
+    callbacks such as database writes never stall the workers.
+    """
+
+    def __init__(self, url: str, fallback: GuidanceBackend, workers: int = 4, queue_size: int = 1000,
+                 batch_size: int = 16, batch_wait: float = 0.05, timeout: float = 10.0,
+                 retries: int = 2, cache_size: int = 4096):
+        self.url = url
+        self.fallback = fallback
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.timeout = timeout
+        self.retries = retries
+        self._cache = LRUCache(cache_size)
+        self._pending: Dict[Hashable, GuidanceRequest] = {}
+        self._pending_lock = threading.Lock()
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "dropped": 0, "requests": 0}
+        self.latencies = deque(maxlen=10_000)
+
+        # One thread keeps callbacks in completion order and off the event loop
+        self._callbacks = ThreadPoolExecutor(max_workers=1, thread_name_prefix="guidance-callbacks")
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="guidance-workers", daemon=True)
+        self._thread.start()
+        self._queue = asyncio.run_coroutine_threadsafe(self._create_queue(queue_size), self._loop).result()
+        for _ in range(workers):
+            asyncio.run_coroutine_threadsafe(self._worker(), self._loop)
+
+    @staticmethod
+    async def _create_queue(queue_size: int) -> asyncio.Queue:
+        # Created on the loop thread so the queue binds to the right event loop
+        return asyncio.Queue(maxsize=queue_size)
+
+    # Public API
+
+    def generate(self, task_title: str, priority: str, category: str) -> str:
+        cached = self._cache.get((task_title, priority, category))
+        return cached if cached is not None else self.fallback.generate(task_title, priority, category)
+
+    def submit(self, key: Hashable, item: GuidanceRequest, on_result: GuidanceCallback) -> bool:
+        cached = self._cache.get(item)
+        if cached is not None:
+            on_result(key, cached)
+            return True
+        with self._pending_lock:
+            self._pending[key] = item
+        self.stats["submitted"] += 1
+        self._loop.call_soon_threadsafe(self._enqueue, (key, item, on_result, time.perf_counter()))
+        return True
+
+    def is_pending(self, key: Hashable) -> bool:
+        return key in self._pending
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self._cancel_workers(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+        self._callbacks.shutdown(wait=True)
+
+    # Worker pool (runs on the backend's event loop)
+
+    async def _cancel_workers(self):
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _enqueue(self, job):
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            self._finish(job[0])
+
+    def _finish(self, key: Hashable):
+        with self._pending_lock:
+            self._pending.pop(key, None)
+
+    def _deliver(self, key: Hashable, text: str, on_result: GuidanceCallback):
+        """Run one result callback on the callback thread"""
+        try:
+            on_result(key, text)
+        except Exception:
+            logger.exception("Guidance callback failed for %s", key)
+        self._finish(key)
+
+    async def _worker(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._process(batch)
+            except Exception:
+                logger.exception("Guidance batch failed")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _process(self, batch):
+        items = [item for _, item, _, _ in batch]
+        guidance = await self._request_with_retries(items)
+        if guidance is None:
+            self.stats["failed"] += len(batch)
+            for key, _, _, _ in batch:
+                self._finish(key)
+            return
+        finished_at = time.perf_counter()
+        for (key, item, on_result, submitted_at), text in zip(batch, guidance):
+            self._cache.put(item, text)
+            self.stats["completed"] += 1
+            self.latencies.append(finished_at - submitted_at)
+            self._callbacks.submit(self._deliver, key, text, on_result)
+
+    async def _request_with_retries(self, items: List[GuidanceRequest]) -> Optional[List[str]]:
+        for attempt in range(self.retries + 1):
+            self.stats["requests"] += 1
+            try:
+                guidance = await asyncio.wait_for(
+                    self._loop.run_in_executor(None, self._post, items), self.timeout
+                )
+                if len(guidance) == len(items):
+                    return guidance
+                logger.warning("Guidance endpoint returned %d results for %d tasks", len(guidance), len(items))
+            except Exception as error:
+                logger.warning("Guidance request failed (attempt %d): %s", attempt + 1, error)
+            if attempt < self.retries:
+                await asyncio.sleep(0.1 * 2 ** attempt)
+        return None
+
+    def _post(self, items: List[GuidanceRequest]) -> List[str]:
+        body = json.dumps({
+            "tasks": [{"title": title, "priority": priority, "category": category}
+                      for title, priority, category in items]
+        }).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode("utf-8"))["guidance"]
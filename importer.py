@@ -0,0 +1,179 @@
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import AppConfig
+from scoring import PriorityScorer
+
+# Guidance is generated for this many tasks per call
+GUIDANCE_BATCH_SIZE = 1_000
+
+IMPORT_FORMATS = {"csv": "CSV", "jsonl": "JSON Lines", "ndjson": "JSON Lines"}
+
+
+@dataclass
+class ImportReport:
+    """Outcome of a bulk import"""
+    imported: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows(self) -> int:
+        return self.imported + len(self.errors)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def _decode_lines(upload: BinaryIO, errors: List[Tuple[int, None, str]], position: Dict[str, int]) -> Iterator[str]:
+    """Decode an upload line by line, collecting lines that are not valid UTF-8 as row errors
+
+    `position["line"]` holds the file line number of the last line yielded.
+    """
+    for line_number, raw in enumerate(upload, start=1):
+        try:
+            line = raw.decode("utf-8-sig" if line_number == 1 else "utf-8")
+        except UnicodeDecodeError as error:
+            errors.append((line_number, None, f"Not valid UTF-8: {error.reason} at byte {error.start}"))
+            continue
+        position["line"] = line_number
+        yield line
+
+
+def iter_rows(upload: BinaryIO, fmt: str) -> Iterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """Yield (file line number, raw row, parse error) one row at a time from an uploaded file
+
+    Undecodable lines and malformed CSV records become row errors instead of
+    aborting the import.
+    """
+    bad_lines: List[Tuple[int, None, str]] = []
+    position = {"line": 0}
+    lines = _decode_lines(upload, bad_lines, position)
+
+    if fmt == "CSV":
+        reader = csv.DictReader(lines)
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as error:
+                row, error_message = None, f"Malformed CSV: {error}"
+            else:
+                error_message = None
+            yield from bad_lines
+            bad_lines.clear()
+            if row is None:
+                yield position["line"], None, error_message
+                continue
+            # A quoted field can span lines; report the line the record starts on
+            embedded_newlines = sum(value.count("\n") for value in row.values() if isinstance(value, str))
+            yield position["line"] - embedded_newlines, row, None
+        yield from bad_lines
+        return
+
+    for line in lines:
+        yield from bad_lines
+        bad_lines.clear()
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as error:
+            yield position["line"], None, f"Invalid JSON: {error.msg}"
+            continue
+        if isinstance(row, dict):
+            yield position["line"], row, None
+        else:
+            yield position["line"], None, "Expected a JSON object"
+    yield from bad_lines
+
+
+def _parse_date(value: str, field_name: str, with_time: bool) -> str:
+    formats = ['%Y-%m-%d %H:%M', '%Y-%m-%d'] if with_time else ['%Y-%m-%d']
+    for fmt in formats:
+        try:
+            parsed = datetime.strptime(value.strip(), fmt)
+        except ValueError:
+            continue
+        return parsed.strftime('%Y-%m-%d %H:%M' if with_time else '%Y-%m-%d')
+    raise ValueError(f"{field_name} must be YYYY-MM-DD, got {value!r}")
+
+
+def validate_row(row: Dict, now: str) -> Dict:
+    """Normalize one imported row into a task dict, raising ValueError if it is invalid"""
+    title = str(row.get("title") or "").strip()
+    if not title:
+        raise ValueError("title is required")
+
+    category = str(row.get("category") or AppConfig.DEFAULT_CATEGORY).strip()
+    if category not in AppConfig.TASK_CATEGORIES:
+        raise ValueError(f"unknown category {category!r}")
+
+    priority = str(row.get("priority") or "Medium").strip()
+    if priority not in AppConfig.TASK_PRIORITIES:
+        raise ValueError(f"unknown priority {priority!r}")
+
+    task = {
+        "title": title,
+        "description": str(row.get("description") or ""),
+        "category": category,
+        "priority": priority,
+        "due_date": _parse_date(str(row["due_date"]), "due_date", False) if row.get("due_date") else None,
+        "created_date": _parse_date(str(row["created_date"]), "created_date", True) if row.get("created_date") else now
+    }
+    if row.get("completed_date"):
+        task["completed_date"] = _parse_date(str(row["completed_date"]), "completed_date", True)
+    return task
+
+
+def prepare_tasks(rows: Iterable[Tuple[int, Optional[Dict], Optional[str]]], scorer: PriorityScorer,
+                  generate_guidance: Callable[[List[Tuple[str, str, str]]], List[str]],
+                  today: str, created: str) -> Tuple[List[Dict], List[Tuple[int, str]]]:
+    """Validate raw rows and give the valid ones a priority score and guidance
+
+    Returns the ready-to-store tasks and a (row number, error) pair for every
+    rejected row.
+    """
+    tasks, errors = [], []
+    for row_number, row, error in rows:
+        if error is None:
+            try:
+                tasks.append(validate_row(row, created))
+                continue
+            except ValueError as invalid:
+                error = str(invalid)
+        errors.append((row_number, error))
+
+    if tasks:
+        for task, score in zip(tasks, scorer.score_tasks(tasks, today)):
+            task["priority_score"] = float(score)
+        for start in range(0, len(tasks), GUIDANCE_BATCH_SIZE):
+            batch = tasks[start:start + GUIDANCE_BATCH_SIZE]
+            guidance = generate_guidance([(task["title"], task["priority"], task["category"]) for task in batch])
+            for task, text in zip(batch, guidance):
+                task["ai_guidance"] = text
+    return tasks, errors
+
+
+def import_tasks(upload: BinaryIO, fmt: str, store, scorer: PriorityScorer,
+                 generate_guidance: Callable[[List[Tuple[str, str, str]]], List[str]],
+                 today: Optional[str] = None) -> ImportReport:
+    """Validate, score and add every row of an upload in a single store transaction"""
+    started = time.perf_counter()
+    now = datetime.now()
+    today = today or now.strftime('%Y-%m-%d')
+    report = ImportReport()
+
+    tasks, report.errors = prepare_tasks(iter_rows(upload, fmt), scorer, generate_guidance,
+                                         today, now.strftime('%Y-%m-%d %H:%M'))
+    if tasks:
+        report.imported = len(store.add_tasks(tasks))
+
+    report.seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,109 @@
+import bisect
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class InsightsAggregator:
+    """Productivity counters maintained incrementally as tasks change
+
+    Every add, complete and delete updates the counters in O(1). Overdue tasks
+    are tracked through a sorted index of the active tasks' due dates, which is
+    only walked when the date changes, so reading the insights never rescans
+    the task history.
+    """
+
+    def __init__(self, today: Optional[str] = None):
+        self.active_count = 0
+        self.completed_count = 0
+        self.category_counts: Dict[str, int] = {}
+        self.priority_counts: Dict[str, int] = {}
+        self._due_counts: Dict[str, int] = {}
+        self._due_dates: List[str] = []
+        self._today = today or datetime.now().strftime('%Y-%m-%d')
+        self._overdue_count = 0
+
+    @classmethod
+    def from_tasks(cls, tasks: List[Dict], completed_tasks: List[Dict],
+                   today: Optional[str] = None) -> "InsightsAggregator":
+        """Build an aggregator from plain task lists"""
+        aggregator = cls(today)
+        for task in tasks:
+            aggregator.task_added(task)
+        for task in completed_tasks:
+            aggregator.add_completed(task.get('category', 'Other'), task.get('priority', 'Medium'))
+        return aggregator
+
+    # Updates
+
+    def task_added(self, task: Dict):
+        self.active_count += 1
+        self._count(task.get('category', 'Other'), task.get('priority', 'Medium'), 1)
+        self._track_due(task.get('due_date'), 1)
+
+    def task_completed(self, task: Dict):
+        self.active_count -= 1
+        self.completed_count += 1
+        self._track_due(task.get('due_date'), -1)
+
+    def task_deleted(self, task: Dict, completed: bool = False):
+        if completed:
+            self.completed_count -= 1
+        else:
+            self.active_count -= 1
+            self._track_due(task.get('due_date'), -1)
+        self._count(task.get('category', 'Other'), task.get('priority', 'Medium'), -1)
+
+    def add_completed(self, category: str, priority: str, count: int = 1):
+        """Count already-completed tasks without needing the task dicts"""
+        self.completed_count += count
+        self._count(category, priority, count)
+
+    def _count(self, category: str, priority: str, delta: int):
+        for counts, key in ((self.category_counts, category), (self.priority_counts, priority)):
+            remaining = counts.get(key, 0) + delta
+            if remaining > 0:
+                counts[key] = remaining
+            else:
+                counts.pop(key, None)
+
+    def _track_due(self, due_date: Optional[str], delta: int):
+        if not due_date:
+            return
+        remaining = self._due_counts.get(due_date, 0) + delta
+        if remaining > 0:
+            if due_date not in self._due_counts:
+                bisect.insort(self._due_dates, due_date)
+            self._due_counts[due_date] = remaining
+        else:
+            self._due_counts.pop(due_date, None)
+            index = bisect.bisect_left(self._due_dates, due_date)
+            if index < len(self._due_dates) and self._due_dates[index] == due_date:
+                del self._due_dates[index]
+        if due_date < self._today:
+            self._overdue_count += delta
+
+    # Reads
+
+    def advance_to(self, today: str):
+        """Move the overdue boundary to `today`, touching only the due dates in between"""
+        if today == self._today:
+            return
+        low, high = sorted((self._today, today))
+        start = bisect.bisect_left(self._due_dates, low)
+        end = bisect.bisect_left(self._due_dates, high)
+        crossed = sum(self._due_counts[due_date] for due_date in self._due_dates[start:end])
+        self._overdue_count += crossed if today > self._today else -crossed
+        self._today = today
+
+    def snapshot(self, today: Optional[str] = None) -> Dict:
+        """Insights dict in the shape the pages expect"""
+        self.advance_to(today or datetime.now().strftime('%Y-%m-%d'))
+        total_tasks = self.active_count + self.completed_count
+        return {
+            "total_tasks": total_tasks,
+            "completion_rate": (self.completed_count / total_tasks * 100) if total_tasks > 0 else 0,
+            "overdue_count": self._overdue_count,
+            "category_distribution": dict(self.category_counts),
+            "priority_distribution": dict(self.priority_counts),
+            "active_tasks": self.active_count
+        }
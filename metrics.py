@@ -0,0 +1,132 @@
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Callable, Deque, Dict, List
+
+from config import AppConfig
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Returned by `span` while metrics are disabled, so a disabled span costs one attribute check
+_DISABLED_SPAN = nullcontext()
+
+
+class _SpanStats:
+    __slots__ = ("durations", "count", "total")
+
+    def __init__(self, window: int):
+        self.durations: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+
+class _Span:
+    __slots__ = ("registry", "name", "started")
+
+    def __init__(self, registry: "MetricsRegistry", name: str):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class MetricsRegistry:
+    """Rolling in-process timings per named span
+
+    Quantiles are computed over the last `window` observations of each span;
+    counts and totals are cumulative since the last reset.
+    """
+
+    def __init__(self, enabled: bool = True, window: int = 1000):
+        self.enabled = enabled
+        self.window = window
+        self._spans: Dict[str, _SpanStats] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str):
+        """Context manager timing the enclosed block"""
+        if not self.enabled:
+            return _DISABLED_SPAN
+        return _Span(self, name)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator timing every call of a function"""
+        def decorator(function: Callable) -> Callable:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - started)
+            return wrapper
+        return decorator
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                stats = self._spans[name] = _SpanStats(self.window)
+            stats.durations.append(seconds)
+            stats.count += 1
+            stats.total += seconds
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+
+    def summary(self) -> List[Dict]:
+        """One row per span with count, mean and rolling p50/p95/p99 in milliseconds"""
+        with self._lock:
+            snapshot = [(name, sorted(stats.durations), stats.count, stats.total)
+                        for name, stats in self._spans.items()]
+        rows = []
+        for name, durations, count, total in sorted(snapshot):
+            row = {"span": name, "count": count, "mean_ms": total / count * 1000}
+            for quantile in QUANTILES:
+                row[f"p{int(quantile * 100)}_ms"] = _quantile(durations, quantile) * 1000
+            rows.append(row)
+        return rows
+
+    def to_prometheus(self, metric: str = "todo_span_seconds") -> str:
+        """Prometheus text exposition of every span as a summary"""
+        lines = [
+            f"# HELP {metric} Duration of instrumented app spans.",
+            f"# TYPE {metric} summary"
+        ]
+        with self._lock:
+            snapshot = [(name, sorted(stats.durations), stats.count, stats.total)
+                        for name, stats in self._spans.items()]
+        for name, durations, count, total in sorted(snapshot):
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            for quantile in QUANTILES:
+                lines.append(f'{metric}{{span="{label}",quantile="{quantile}"}} {_quantile(durations, quantile):.6f}')
+            lines.append(f'{metric}_sum{{span="{label}"}} {total:.6f}')
+            lines.append(f'{metric}_count{{span="{label}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> str:
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(self.to_prometheus())
+        return path
+
+
+def _quantile(sorted_values: List[float], quantile: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(quantile * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+# Registry shared by the whole process
+registry = MetricsRegistry(enabled=AppConfig.METRICS_ENABLED, window=AppConfig.METRICS_WINDOW)
@@ -0,0 +1,121 @@
+"""Local stand-in for the LLM guidance endpoint
+
+Serves POST /v1/guidance with canned "model" answers after a configurable delay,
+so the HTTP guidance backend can be exercised and measured without network access:
+
+    python mock_llm_server.py --port 8765 --latency 0.3
+    python mock_llm_server.py --measure 500
+"""
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    """Answers guidance batches in the format HTTPGuidanceBackend expects"""
+
+    def do_POST(self):
+        if self.path != "/v1/guidance":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            tasks = json.loads(self.rfile.read(length))["tasks"]
+        except (ValueError, KeyError):
+            self.send_error(400, "Expected {\"tasks\": [...]}")
+            return
+
+        time.sleep(self.server.latency)
+        if random.random() < self.server.failure_rate:
+            self.send_error(503, "Simulated model failure")
+            return
+
+        body = json.dumps({
+            "guidance": [
+                f"🤖 **Model Guidance**: Start '{task['title']}' by writing down the first concrete step, "
+                f"then block time for it according to its {task['priority'].lower()} priority.\n\n"
+                f"Keep your other {task['category'].lower()} commitments in view while you work on it."
+                for task in tasks
+            ]
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_server(host: str = "127.0.0.1", port: int = 0, latency: float = 0.2,
+                      failure_rate: float = 0.0) -> ThreadingHTTPServer:
+    """Start the mock server on a daemon thread; port 0 picks a free port"""
+    server = ThreadingHTTPServer((host, port), MockLLMHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.failure_rate = failure_rate
+    threading.Thread(target=server.serve_forever, name="mock-llm", daemon=True).start()
+    return server
+
+
+def measure(requests: int, latency: float, failure_rate: float, **backend_options) -> Dict:
+    """Push `requests` guidance jobs through HTTPGuidanceBackend against a local mock server"""
+    from guidance_backends import GuidanceBackend, HTTPGuidanceBackend
+
+    server = start_mock_server(latency=latency, failure_rate=failure_rate)
+    url = f"http://{server.server_address[0]}:{server.server_address[1]}/v1/guidance"
+    backend = HTTPGuidanceBackend(url, fallback=GuidanceBackend(), queue_size=max(requests, 1),
+                                  **backend_options)
+    started = time.perf_counter()
+    for task_id in range(requests):
+        backend.submit(task_id, (f"Task {task_id}", "Medium", "Work"), lambda *_: None)
+
+    while any(backend.is_pending(task_id) for task_id in range(requests)):
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    backend.close()
+    server.shutdown()
+
+    latencies = sorted(backend.latencies)
+    return {
+        **backend.stats,
+        "seconds": round(elapsed, 3),
+        "throughput_per_second": round(backend.stats["completed"] / elapsed, 1) if elapsed else 0.0,
+        "latency_p50": round(statistics.median(latencies), 4) if latencies else None,
+        "latency_p95": round(latencies[int(len(latencies) * 0.95) - 1], 4) if latencies else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds to wait before answering")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--measure", type=int, metavar="N",
+                        help="instead of serving, send N jobs through the HTTP backend and print stats")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.latency, args.failure_rate,
+                                 workers=args.workers, batch_size=args.batch_size), indent=2))
+        return
+
+    server = start_mock_server(args.host, args.port, args.latency, args.failure_rate)
+    print(f"Mock LLM listening on http://{args.host}:{server.server_address[1]}/v1/guidance")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
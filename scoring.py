@@ -0,0 +1,91 @@
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DEFAULT_PRIORITY_WEIGHTS = {"High": 10, "Medium": 6, "Low": 3}
+DEFAULT_CATEGORY_WEIGHTS = {"Work": 1.2, "Health": 1.1, "Personal": 1.0, "Learning": 0.9, "Finance": 1.15, "Other": 0.8}
+
+# (max days until due, urgency multiplier), checked in order; anything later gets 1.0
+URGENCY_BUCKETS = [(1, 2.0), (3, 1.5), (7, 1.2)]
+
+
+class PriorityScorer:
+    """Smart priority score from priority, category and days until due"""
+
+    def __init__(self, priority_weights: Optional[Dict[str, float]] = None,
+                 category_weights: Optional[Dict[str, float]] = None):
+        self.priority_weights = dict(priority_weights or DEFAULT_PRIORITY_WEIGHTS)
+        self.category_weights = dict(category_weights or DEFAULT_CATEGORY_WEIGHTS)
+
+    def score(self, priority: str, days_until_due: Optional[int], category: str) -> float:
+        """Score a single task; without a due date (None) it gets no urgency boost, as in `score_tasks`"""
+        base_score = self.priority_weights.get(priority, 6)
+        category_multiplier = self.category_weights.get(category, 1.0)
+
+        urgency_multiplier = 1.0
+        for max_days, multiplier in URGENCY_BUCKETS:
+            if days_until_due is not None and days_until_due <= max_days:
+                urgency_multiplier = multiplier
+                break
+
+        return base_score * category_multiplier * urgency_multiplier
+
+    def score_tasks(self, tasks: List[Dict], today: str) -> "np.ndarray":
+        """Score many tasks in one vectorized pass, relative to `today` (YYYY-MM-DD)"""
+        import numpy as np  # deferred so importing the scorer does not pull in numpy
+
+        count = len(tasks)
+        base = np.fromiter(
+            (self.priority_weights.get(task["priority"], 6) for task in tasks), dtype=float, count=count
+        )
+        category = np.fromiter(
+            (self.category_weights.get(task["category"], 1.0) for task in tasks), dtype=float, count=count
+        )
+        # Tasks without a due date become NaT, which fails every bucket test
+        due = np.array([task.get("due_date") for task in tasks], dtype="datetime64[D]")
+        days_until_due = due - np.datetime64(today, "D")
+
+        urgency = np.select(
+            [days_until_due <= np.timedelta64(max_days, "D") for max_days, _ in URGENCY_BUCKETS],
+            [multiplier for _, multiplier in URGENCY_BUCKETS],
+            default=1.0
+        )
+        return base * category * urgency
+
+
+class RescoringEngine:
+    """Re-scores each store's active tasks once per day boundary"""
+
+    def __init__(self, scorer: Optional[PriorityScorer] = None):
+        self.scorer = scorer or PriorityScorer()
+        self._lock = threading.Lock()
+        # One lock per store path, so workspaces re-score independently
+        self._store_locks: Dict[str, threading.Lock] = {}
+        # Store path -> date it was last scored for
+        self._scored_for: Dict[str, str] = {}
+
+    def is_due(self, store, today: str) -> bool:
+        return self._scored_for.get(store.path) != today
+
+    def run(self, store, today: Optional[str] = None) -> List[int]:
+        """Re-score the store's active tasks if needed; returns the ids whose score changed"""
+        today = today or datetime.now().strftime('%Y-%m-%d')
+        with self._lock:
+            store_lock = self._store_locks.setdefault(store.path, threading.Lock())
+        with store_lock:
+            if not self.is_due(store, today):
+                return []
+            tasks = store.active_tasks()
+            scores = {}
+            if tasks:
+                scores = {
+                    task["id"]: float(score)
+                    for task, score in zip(tasks, self.scorer.score_tasks(tasks, today))
+                    if score != task["priority_score"]
+                }
+                store.apply_scores(scores)
+            self._scored_for[store.path] = today
+            return list(scores)
@@ -0,0 +1,133 @@
+import math
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from sorted_list import SortedList
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Title matches count more than description matches
+TITLE_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Query terms at least this long also match longer words that start with them
+MIN_PREFIX_LENGTH = 2
+PREFIX_MATCH_DISCOUNT = 0.8
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class SearchIndex:
+    """Inverted index over task titles and descriptions
+
+    Postings map each token to the tasks containing it with a title-weighted term
+    frequency. The vocabulary is a SortedList, so prefix matching seeks to the
+    first candidate word, and a word that enters or leaves it costs O(log V)
+    plus a bounded sublist shift. Adding or removing a task therefore costs
+    O(its tokens * log V); queries only touch the postings of the matching
+    words, never the task list.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._task_tokens: Dict[int, List[str]] = {}
+        self._vocabulary = SortedList()
+
+    def __len__(self) -> int:
+        return len(self._task_tokens)
+
+    def add(self, task: Dict):
+        self.remove(task["id"])
+        for token in self._index(task):
+            self._vocabulary.add(token)
+
+    def extend(self, tasks: Iterable[Dict]):
+        """Index many tasks, sorting the vocabulary once at the end"""
+        new_tokens = []
+        for task in tasks:
+            self.remove(task["id"])
+            new_tokens.extend(self._index(task))
+        if new_tokens:
+            self._vocabulary.update(new_tokens)
+
+    def _index(self, task: Dict) -> List[str]:
+        """Add a task's postings and return the tokens that are new to the vocabulary"""
+        weights: Dict[str, float] = {}
+        for token in tokenize(task.get("title", "")):
+            weights[token] = weights.get(token, 0.0) + TITLE_WEIGHT
+        for token in tokenize(task.get("description", "")):
+            weights[token] = weights.get(token, 0.0) + DESCRIPTION_WEIGHT
+
+        new_tokens = []
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                new_tokens.append(token)
+            postings[task["id"]] = weight
+        self._task_tokens[task["id"]] = list(weights)
+        return new_tokens
+
+    def remove(self, task_id: int):
+        for token in self._task_tokens.pop(task_id, ()):
+            postings = self._postings[token]
+            del postings[task_id]
+            if not postings:
+                del self._postings[token]
+                self._vocabulary.remove(token)
+
+    def _expand(self, term: str) -> Dict[str, float]:
+        """Vocabulary words matching a query term, with the weight of each match"""
+        words = {term: 1.0} if term in self._postings else {}
+        if len(term) >= MIN_PREFIX_LENGTH:
+            for word in self._vocabulary.irange_from(term):
+                if not word.startswith(term):
+                    break
+                words.setdefault(word, PREFIX_MATCH_DISCOUNT)
+        return words
+
+    def search(self, query: str, accept: Optional[Callable[[int], bool]] = None) -> List[int]:
+        """Ids of tasks matching every query term, best match first
+
+        `accept` applies structured filters to the candidates that survive the
+        text match.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        total = max(len(self._task_tokens), 1)
+        scores: Optional[Dict[int, float]] = None
+        # Start from the rarest term so the intersection stays small
+        expansions = sorted(
+            (self._expand(term) for term in terms),
+            key=lambda words: sum(len(self._postings[word]) for word in words)
+        )
+        for words in expansions:
+            term_scores: Dict[int, float] = {}
+            for word, match_weight in words.items():
+                postings = self._postings[word]
+                idf = math.log(1 + total / len(postings))
+                if scores is not None and len(scores) < len(postings):
+                    # Probe the postings with the surviving candidates instead of walking them
+                    pairs = ((task_id, postings[task_id]) for task_id in scores if task_id in postings)
+                else:
+                    pairs = ((task_id, weight) for task_id, weight in postings.items()
+                             if scores is None or task_id in scores)
+                for task_id, weight in pairs:
+                    score = weight * idf * match_weight
+                    if score > term_scores.get(task_id, 0.0):
+                        term_scores[task_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {task_id: scores[task_id] + score for task_id, score in term_scores.items()}
+            if not scores:
+                return []
+
+        matches: Set[int] = set(scores)
+        if accept is not None:
+            matches = {task_id for task_id in matches if accept(task_id)}
+        return sorted(matches, key=lambda task_id: (-scores[task_id], task_id))
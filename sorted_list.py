@@ -0,0 +1,123 @@
+import bisect
+from typing import Any, Iterable, Iterator, List, Optional
+
+# Target length of each sublist; an insert or removal shifts at most twice this many items
+SUBLIST_LOAD = 1000
+
+
+class SortedList:
+    """Sorted sequence kept as a list of bounded sublists
+
+    A value's sublist is found by bisecting the sublists' maxima, so an insert
+    or removal costs O(log n) comparisons plus a shift of at most
+    2 * SUBLIST_LOAD items, where one flat list would shift O(n). Positional
+    slices skip whole sublists by their length. This is the layout of
+    sortedcontainers.SortedList, without the extra dependency.
+    """
+
+    def __init__(self, values: Iterable = ()):
+        self._lists: List[List] = []
+        self._maxes: List = []
+        self._len = 0
+        self.update(values)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        for sublist in self._lists:
+            yield from sublist
+
+    def __contains__(self, value: Any) -> bool:
+        position = bisect.bisect_left(self._maxes, value)
+        if position == len(self._maxes):
+            return False
+        sublist = self._lists[position]
+        return sublist[bisect.bisect_left(sublist, value)] == value
+
+    def add(self, value: Any):
+        if not self._maxes:
+            self._lists.append([value])
+            self._maxes.append(value)
+            self._len = 1
+            return
+        position = bisect.bisect_left(self._maxes, value)
+        if position == len(self._maxes):
+            position -= 1
+            self._lists[position].append(value)
+            self._maxes[position] = value
+        else:
+            bisect.insort(self._lists[position], value)
+        self._len += 1
+        if len(self._lists[position]) > 2 * SUBLIST_LOAD:
+            self._split(position)
+
+    def update(self, values: Iterable):
+        """Add many values with a single sort"""
+        merged = sorted([*self, *values]) if self._len else sorted(values)
+        self._lists = [merged[start:start + SUBLIST_LOAD] for start in range(0, len(merged), SUBLIST_LOAD)]
+        self._maxes = [sublist[-1] for sublist in self._lists]
+        self._len = len(merged)
+
+    def remove(self, value: Any):
+        """Remove one occurrence of `value`; raises ValueError if it is absent"""
+        position = bisect.bisect_left(self._maxes, value)
+        if position < len(self._maxes):
+            sublist = self._lists[position]
+            index = bisect.bisect_left(sublist, value)
+            if sublist[index] == value:
+                del sublist[index]
+                self._len -= 1
+                if not sublist:
+                    del self._lists[position]
+                    del self._maxes[position]
+                else:
+                    self._maxes[position] = sublist[-1]
+                    if len(sublist) < SUBLIST_LOAD // 4 and len(self._lists) > 1:
+                        self._merge(position)
+                return
+        raise ValueError(f"{value!r} is not in the list")
+
+    def slice(self, start: int = 0, stop: Optional[int] = None) -> List:
+        """Values at positions start..stop, skipping whole sublists before `start`"""
+        remaining = (self._len if stop is None else min(stop, self._len)) - start
+        values = []
+        for sublist in self._lists:
+            if remaining <= 0:
+                break
+            if start >= len(sublist):
+                start -= len(sublist)
+                continue
+            chunk = sublist[start:start + remaining]
+            values.extend(chunk)
+            remaining -= len(chunk)
+            start = 0
+        return values
+
+    def irange_from(self, value: Any) -> Iterator:
+        """Values greater than or equal to `value`, in order"""
+        position = bisect.bisect_left(self._maxes, value)
+        if position == len(self._maxes):
+            return
+        sublist = self._lists[position]
+        for index in range(bisect.bisect_left(sublist, value), len(sublist)):
+            yield sublist[index]
+        for position in range(position + 1, len(self._lists)):
+            yield from self._lists[position]
+
+    def _split(self, position: int):
+        sublist = self._lists[position]
+        tail = sublist[SUBLIST_LOAD:]
+        del sublist[SUBLIST_LOAD:]
+        self._maxes[position] = sublist[-1]
+        self._lists.insert(position + 1, tail)
+        self._maxes.insert(position + 1, tail[-1])
+
+    def _merge(self, position: int):
+        """Fold a short sublist into a neighbour so sublists stay near SUBLIST_LOAD"""
+        if position == len(self._lists) - 1:
+            position -= 1
+        self._lists[position].extend(self._lists.pop(position + 1))
+        del self._maxes[position]
+        if len(self._lists[position]) > 2 * SUBLIST_LOAD:
+            self._split(position)
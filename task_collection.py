@@ -0,0 +1,87 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sorted_list import SortedList
+
+# Sort key of a task in the priority order: (-priority_score, id)
+OrderKey = Tuple[float, int]
+
+
+class TaskCollection:
+    """Active tasks indexed by id and kept in descending priority order
+
+    Tasks arrive with the ids their store assigned. The priority order is a
+    SortedList of keys, so adding, removing or re-scoring a task costs
+    O(log n) plus a bounded sublist shift, and a page of the ranking is sliced
+    out by position without walking the tasks in front of it.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[int, Dict] = {}
+        self._keys: Dict[int, OrderKey] = {}
+        self._order = SortedList()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._tasks
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Iterate over tasks from highest to lowest priority score"""
+        for _, task_id in self._order:
+            yield self._tasks[task_id]
+
+    def get(self, task_id: int) -> Optional[Dict]:
+        return self._tasks.get(task_id)
+
+    def add(self, task: Dict):
+        """Index a task that already carries an id"""
+        task_id = task["id"]
+        if task_id in self._tasks:
+            raise KeyError(f"Task {task_id} is already in the collection")
+        self._tasks[task_id] = task
+        key = self._keys[task_id] = (-task["priority_score"], task_id)
+        self._order.add(key)
+
+    def extend(self, tasks: Iterable[Dict]):
+        """Index many tasks at once, sorting the priority order a single time"""
+        keys = []
+        for task in tasks:
+            task_id = task["id"]
+            if task_id in self._tasks:
+                raise KeyError(f"Task {task_id} is already in the collection")
+            self._tasks[task_id] = task
+            keys.append((-task["priority_score"], task_id))
+            self._keys[task_id] = keys[-1]
+        self._order.update(keys)
+
+    def remove(self, task_id: int) -> Optional[Dict]:
+        """Drop a task from the collection"""
+        task = self._tasks.pop(task_id, None)
+        if task is not None:
+            self._order.remove(self._keys.pop(task_id))
+        return task
+
+    def update_scores(self, scores: Dict[int, float]):
+        """Change many tasks' scores at once
+
+        A few changes move their keys one by one; once a large share of the
+        tasks changed, the priority order is rebuilt with a single sort instead.
+        """
+        changed = [(task_id, priority_score) for task_id, priority_score in scores.items()
+                   if task_id in self._tasks and self._tasks[task_id]["priority_score"] != priority_score]
+        rebuild = len(changed) * 8 > len(self._tasks)
+        for task_id, priority_score in changed:
+            self._tasks[task_id]["priority_score"] = priority_score
+            key = (-priority_score, task_id)
+            if not rebuild:
+                self._order.remove(self._keys[task_id])
+                self._order.add(key)
+            self._keys[task_id] = key
+        if rebuild:
+            self._order = SortedList(self._keys.values())
+
+    def ranked(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """Tasks in priority order, optionally sliced to one page"""
+        keys = self._order.slice(offset, None if limit is None else offset + limit)
+        return [self._tasks[task_id] for _, task_id in keys]
@@ -0,0 +1,127 @@
+from datetime import datetime
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from config import AppConfig
+from guidance import GuidanceEngine
+from guidance_backends import GuidanceBackend, HTTPGuidanceBackend, TemplateGuidanceBackend
+from importer import prepare_tasks
+from scoring import RescoringEngine
+from task_store import TaskStore
+
+
+def create_guidance_backend() -> GuidanceBackend:
+    """Guidance backend selected by GUIDANCE_BACKEND, with templates compiled once"""
+    engine = GuidanceEngine.from_file(AppConfig.GUIDANCE_DATA_PATH, seed=AppConfig.GUIDANCE_SEED,
+                                      cache_size=AppConfig.GUIDANCE_CACHE_SIZE)
+    templates = TemplateGuidanceBackend(engine)
+    if AppConfig.GUIDANCE_BACKEND == "http":
+        return HTTPGuidanceBackend(
+            AppConfig.LLM_GUIDANCE_URL, fallback=templates, workers=AppConfig.LLM_WORKERS,
+            queue_size=AppConfig.LLM_QUEUE_SIZE, batch_size=AppConfig.LLM_BATCH_SIZE,
+            batch_wait=AppConfig.LLM_BATCH_WAIT, timeout=AppConfig.LLM_TIMEOUT,
+            retries=AppConfig.LLM_RETRIES, cache_size=AppConfig.GUIDANCE_CACHE_SIZE
+        )
+    return templates
+
+
+class TaskEngine:
+    """Task operations on one store, free of any UI code
+
+    Scoring, guidance, ranking and insights live here so the Streamlit app, the
+    HTTP API and scripts all drive the same logic. Single-task methods mirror
+    the UI's clicks; the bulk methods do their work in one store transaction.
+
+    Guidance refinements are tracked under `(name, task_id)` because task ids are
+    only unique within one store; `on_guidance` receives that key with the text.
+    """
+
+    def __init__(self, store: TaskStore, guidance: GuidanceBackend,
+                 rescoring: Optional[RescoringEngine] = None, name: Optional[str] = None,
+                 on_guidance: Optional[Callable[[Tuple, str], None]] = None):
+        self.store = store
+        self.guidance = guidance
+        self.rescoring = rescoring or RescoringEngine()
+        self.name = name
+        self.on_guidance = on_guidance or (lambda key, text: store.update_guidance(key[1], text))
+
+    # Task building
+
+    def score(self, priority: str, days_until_due: Optional[int], category: str) -> float:
+        return self.rescoring.scorer.score(priority, days_until_due, category)
+
+    def new_task(self, title: str, category: str, priority: str, due_date: Optional[str],
+                 description: str = "", created_date: Optional[str] = None) -> Dict:
+        """An unsaved task with its priority score and template guidance"""
+        now = datetime.now()
+        days_until_due = (datetime.strptime(due_date, '%Y-%m-%d').date() - now.date()).days if due_date else None
+        return {
+            "title": title,
+            "description": description,
+            "category": category,
+            "priority": priority,
+            "due_date": due_date,
+            "created_date": created_date or now.strftime('%Y-%m-%d %H:%M'),
+            "priority_score": self.score(priority, days_until_due, category),
+            "ai_guidance": self.guidance.generate(title, priority, category)
+        }
+
+    def guidance_key(self, task_id: int) -> Hashable:
+        return (self.name, task_id)
+
+    def is_guidance_pending(self, task_id: int) -> bool:
+        return self.guidance.is_pending(self.guidance_key(task_id))
+
+    # Writes
+
+    def add_task(self, task: Dict) -> Dict:
+        """Store a task and ask the guidance backend for a refined version"""
+        new_task = self.store.add_task(task)
+        self.guidance.submit(self.guidance_key(new_task['id']),
+                             (new_task['title'], new_task['priority'], new_task['category']),
+                             self.on_guidance)
+        return new_task
+
+    def add_tasks(self, rows: List[Dict], today: Optional[str] = None) -> Tuple[List[Dict], List[Tuple[int, str]]]:
+        """Validate, score and store many raw rows in one transaction
+
+        Rows use the bulk-import fields. Returns the stored tasks and an
+        (index, error) pair for every rejected row.
+        """
+        now = datetime.now()
+        tasks, errors = prepare_tasks(
+            ((index, row, None if isinstance(row, dict) else "Expected a JSON object")
+             for index, row in enumerate(rows)),
+            self.rescoring.scorer, self.guidance.generate_many,
+            today or now.strftime('%Y-%m-%d'), now.strftime('%Y-%m-%d %H:%M')
+        )
+        return (self.store.add_tasks(tasks) if tasks else []), errors
+
+    def complete_task(self, task_id: int, expected_version: Optional[int] = None) -> bool:
+        return self.store.complete_task(task_id, expected_version=expected_version)
+
+    def complete_tasks(self, task_ids: List[int]) -> List[int]:
+        """Complete many tasks at once; returns the ids that were active"""
+        return self.store.complete_tasks(task_ids)
+
+    def delete_task(self, task_id: int, expected_version: Optional[int] = None) -> bool:
+        return self.store.delete_task(task_id, expected_version=expected_version)
+
+    def rescore(self, today: Optional[str] = None) -> List[int]:
+        """Refresh urgency once per day; returns the ids whose score changed"""
+        return self.rescoring.run(self.store, today)
+
+    # Reads
+
+    def ranked(self, offset: int = 0, limit: Optional[int] = None, query: str = "",
+               **filters) -> Tuple[int, List[Dict]]:
+        """Total matches and one page of active tasks, by relevance when `query` is set,
+        otherwise by priority score"""
+        if query.strip():
+            matches = self.store.search_active(query, **filters)
+            return len(matches), matches[offset:None if limit is None else offset + limit]
+        return (self.store.count_active(**filters),
+                self.store.query_active(**filters, offset=offset, limit=limit))
+
+    def insights(self, today: Optional[str] = None) -> Dict:
+        return self.store.insights(today)
+
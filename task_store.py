@@ -0,0 +1,574 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import archive
+import timeline
+from insights import InsightsAggregator
+from search import SearchIndex
+from task_collection import TaskCollection
+
+# Columns of a task row, in the order they are stored
+TASK_COLUMNS = [
+    "id", "title", "description", "category", "priority", "due_date",
+    "created_date", "priority_score", "ai_guidance", "completed_date"
+]
+
+# Seconds a connection waits for another process's write lock before giving up
+BUSY_TIMEOUT = 30.0
+
+# Rows inserted per write transaction, so a bulk add holds the write lock briefly
+ADD_BATCH_ROWS = 5_000
+
+# Each entry upgrades the schema by one version (tracked in PRAGMA user_version)
+MIGRATIONS = [
+    """
+    CREATE TABLE tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        description TEXT NOT NULL DEFAULT '',
+        category TEXT NOT NULL,
+        priority TEXT NOT NULL,
+        due_date TEXT,
+        created_date TEXT NOT NULL,
+        priority_score REAL NOT NULL,
+        ai_guidance TEXT NOT NULL DEFAULT '',
+        completed INTEGER NOT NULL DEFAULT 0,
+        completed_date TEXT
+    );
+    CREATE INDEX idx_tasks_due_date ON tasks(due_date);
+    CREATE INDEX idx_tasks_priority_score ON tasks(priority_score);
+    CREATE INDEX idx_tasks_category ON tasks(category);
+    CREATE INDEX idx_tasks_completed ON tasks(completed, priority_score DESC);
+    """,
+    """
+    CREATE TABLE task_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task_id INTEGER NOT NULL,
+        kind TEXT NOT NULL,
+        occurred_at TEXT NOT NULL
+    );
+    CREATE TABLE task_rollups (
+        grain TEXT NOT NULL,
+        bucket TEXT NOT NULL,
+        added INTEGER NOT NULL DEFAULT 0,
+        completed INTEGER NOT NULL DEFAULT 0,
+        deleted INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (grain, bucket)
+    ) WITHOUT ROWID;
+    CREATE TABLE rollup_state (last_event_id INTEGER NOT NULL);
+    INSERT INTO rollup_state (last_event_id) VALUES (0);
+    INSERT INTO task_events (task_id, kind, occurred_at)
+        SELECT id, 'added', created_date FROM tasks ORDER BY id;
+    INSERT INTO task_events (task_id, kind, occurred_at)
+        SELECT id, 'completed', completed_date FROM tasks WHERE completed = 1 ORDER BY completed_date;
+    """,
+    """
+    ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 1;
+    """,
+    """
+    CREATE TABLE archive_segments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        file_name TEXT NOT NULL UNIQUE,
+        rows INTEGER NOT NULL,
+        created_from TEXT NOT NULL,
+        created_to TEXT NOT NULL,
+        completed_from TEXT NOT NULL,
+        completed_to TEXT NOT NULL,
+        archived_at TEXT NOT NULL
+    );
+    CREATE TABLE archived_counts (
+        category TEXT NOT NULL,
+        priority TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (category, priority)
+    ) WITHOUT ROWID;
+    CREATE INDEX idx_tasks_completed_date ON tasks(completed, completed_date);
+    """,
+]
+
+
+class ConcurrentModificationError(Exception):
+    """A task was changed by another session since the caller last read it"""
+
+
+class TaskStore:
+    """Durable SQLite-backed storage for active and completed tasks
+
+    One store is shared by every session of a workspace. Reads and writes are
+    serialized on a re-entrant lock; each row carries a version number that
+    complete and delete can check so concurrent clicks don't clobber each other.
+
+    Other processes (Streamlit replicas, the HTTP API) may open the same file.
+    Ids come from SQLite's own sequence inside the write transaction. When
+    PRAGMA data_version shows that another connection has committed, the
+    task_events it logged since the last look are replayed onto the in-memory
+    indexes; only a gap in the log (events removed by archiving) or a backlog
+    larger than the active set falls back to a full reload. Rescoring logs no
+    events: scores follow from the tasks and the date, so every process
+    computes the same ones on its own daily rescore.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.archive_directory = archive.archive_directory(path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self.data_version = 0
+        self._migrate()
+        # PRAGMA data_version as of the last reload; None until the first one
+        self._seen_version: Optional[int] = None
+        with self._lock:
+            self._refresh()
+        # Cutoff date of the last archive pass, so it runs at most once per cutoff
+        self.archived_before: Optional[str] = None
+
+    def _refresh(self):
+        """Reload the in-memory indexes if another connection committed since the last
+        look; the caller holds the lock"""
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._seen_version:
+            return
+        # Read everything from one snapshot unless a write transaction already pins it
+        started = not self._conn.in_transaction
+        if started:
+            self._conn.execute("BEGIN")
+        try:
+            last_id = timeline.last_event_id(self._conn)
+            if self._seen_version is None or not self._replay(last_id):
+                self.active = self._load_active()
+                self.aggregator = self._load_aggregator()
+                self.search_index = SearchIndex()
+                self.search_index.extend(self.active)
+            # Id of the last event logged for any task change, so derived views know when
+            # to refresh; it is persisted, so a reopened store never reuses an older value
+            self.data_version = last_id
+        finally:
+            if started:
+                self._conn.execute("COMMIT")
+        self._seen_version = version
+
+    def _replay(self, last_id: int) -> bool:
+        """Apply other connections' events after `data_version` up to `last_id` to the
+        in-memory indexes; returns False when a full reload is needed instead"""
+        pending = last_id - self.data_version
+        if pending > len(self.active):
+            return False
+        kinds: Dict[int, Set[str]] = {}
+        rows = self._conn.execute(
+            "SELECT task_id, kind FROM task_events WHERE id > ? AND id <= ?", (self.data_version, last_id)
+        ).fetchall()
+        if len(rows) != pending:
+            return False
+        for task_id, kind in rows:
+            kinds.setdefault(task_id, set()).add(kind)
+
+        recount = False
+        task_ids = list(kinds)
+        # Rows are looked up in chunks that stay under SQLite's bound-parameter limit
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start:start + 500]
+            current = {row["id"]: self._row_to_task(row) for row in self._conn.execute(
+                f"SELECT {', '.join(TASK_COLUMNS)}, version FROM tasks "
+                f"WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+            )}
+            for task_id in chunk:
+                task, known = current.get(task_id), self.active.remove(task_id)
+                if known is not None:
+                    self.search_index.remove(task_id)
+                    if task is not None and "completed_date" in task:
+                        self.aggregator.task_completed(known)
+                    else:
+                        self.aggregator.task_deleted(known)
+                elif task is None:
+                    # A task completed before the window was deleted, taking its counts with it
+                    recount = recount or "added" not in kinds[task_id]
+                elif "completed_date" in task and "added" in kinds[task_id]:
+                    self.aggregator.add_completed(task["category"], task["priority"])
+                if task is not None and "completed_date" not in task:
+                    self.active.add(task)
+                    self.aggregator.task_added(task)
+                    self.search_index.add(task)
+        if recount:
+            self.aggregator = self._load_aggregator()
+        return True
+
+    @contextmanager
+    def _current(self):
+        """Hold the lock with the in-memory indexes caught up on other connections' writes"""
+        with self._lock:
+            self._refresh()
+            yield
+
+    def _load_active(self) -> TaskCollection:
+        """Build the in-memory index of active tasks"""
+        active = TaskCollection()
+        rows = self._query(f"SELECT {', '.join(TASK_COLUMNS)}, version FROM tasks WHERE completed = 0")
+        active.extend(self._row_to_task(row) for row in rows)
+        return active
+
+    def _load_aggregator(self) -> InsightsAggregator:
+        """Seed the insights counters from the active index and completed-task totals"""
+        aggregator = InsightsAggregator.from_tasks(list(self.active), [])
+        rows = self._query(
+            "SELECT category, priority, COUNT(*) FROM tasks WHERE completed = 1 GROUP BY category, priority"
+        )
+        with self._lock:
+            rows += archive.archived_counts(self._conn)
+        for category, priority, count in rows:
+            aggregator.add_completed(category, priority, count)
+        return aggregator
+
+    def _migrate(self):
+        """Bring the database schema up to the latest version
+
+        An up-to-date database is left untouched: a write here would bump
+        PRAGMA data_version and make every other process refresh.
+        """
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS):
+            return
+        with self._transaction(refresh=False) as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for script in MIGRATIONS[version:]:
+                for statement in script.split(";"):
+                    if statement.strip():
+                        conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {len(MIGRATIONS)}")
+            timeline.catch_up(conn)
+
+    @contextmanager
+    def _transaction(self, refresh: bool = True):
+        """Run the enclosed statements in a single write transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if refresh:
+                    self._refresh()
+                data_version = self.data_version
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                # Events logged by the rolled-back writes are gone; replay must not skip past them
+                self.data_version = data_version
+                raise
+            self._conn.execute("COMMIT")
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _row_to_task(row: sqlite3.Row) -> Dict:
+        task = dict(zip(row.keys(), row))
+        if task["completed_date"] is None:
+            del task["completed_date"]
+        return task
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # Writes
+
+    def add_task(self, task: Dict) -> Dict:
+        """Insert a new active task and return it with its assigned id"""
+        return self.add_tasks([task])[0]
+
+    def add_tasks(self, tasks: List[Dict]) -> List[Dict]:
+        """Insert many tasks; tasks with a completed_date go in as completed
+
+        Every ADD_BATCH_ROWS tasks are committed in their own transaction, so
+        other sessions and processes wait for one batch at most. If a batch
+        fails, the batches before it stay stored.
+        """
+        new_tasks = []
+        for start in range(0, len(tasks), ADD_BATCH_ROWS):
+            new_tasks.extend(self._add_batch(tasks[start:start + ADD_BATCH_ROWS]))
+        return new_tasks
+
+    def _add_batch(self, tasks: List[Dict]) -> List[Dict]:
+        with self._transaction() as conn:
+            # SQLite's sequence is read under the write lock, so no other process can
+            # hand out the same ids; the inserts advance it past the new ones
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'tasks'").fetchone()
+            first_id = (row[0] if row else 0) + 1
+            new_tasks = [{**task, "id": first_id + offset, "version": 1} for offset, task in enumerate(tasks)]
+            conn.executemany(
+                "INSERT INTO tasks (id, title, description, category, priority, due_date, created_date, "
+                "priority_score, ai_guidance, completed, completed_date) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (task["id"], task["title"], task.get("description", ""), task["category"],
+                     task["priority"], task.get("due_date"), task["created_date"], task["priority_score"],
+                     task.get("ai_guidance", ""), int(bool(task.get("completed_date"))),
+                     task.get("completed_date"))
+                    for task in new_tasks
+                ]
+            )
+            events = []
+            for task in new_tasks:
+                events.append((task["id"], "added", task["created_date"]))
+                if task.get("completed_date"):
+                    events.append((task["id"], "completed", task["completed_date"]))
+            self.data_version = timeline.record_events(conn, events)
+
+            for task in new_tasks:
+                if task.get("completed_date"):
+                    self.aggregator.add_completed(task["category"], task["priority"])
+                else:
+                    self.active.add(task)
+                    self.aggregator.task_added(task)
+                    self.search_index.add(task)
+        return new_tasks
+
+    def complete_task(self, task_id: int, completed_date: Optional[str] = None,
+                      expected_version: Optional[int] = None) -> bool:
+        """Mark an active task as completed; returns False if it was not active
+
+        With `expected_version`, raises ConcurrentModificationError instead when
+        the task was completed, deleted or changed since that version was read.
+        """
+        completed_date = completed_date or datetime.now().strftime('%Y-%m-%d %H:%M')
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET completed = 1, completed_date = ?, version = version + 1 "
+                "WHERE id = ? AND completed = 0 AND (? IS NULL OR version = ?)",
+                (completed_date, task_id, expected_version, expected_version)
+            )
+            if cursor.rowcount == 0:
+                if expected_version is not None:
+                    raise ConcurrentModificationError(f"Task {task_id} was changed by someone else")
+                return False
+            self.data_version = timeline.record_event(conn, task_id, "completed", completed_date)
+            task = self.active.remove(task_id)
+            if task is not None:
+                self.aggregator.task_completed(task)
+                self.search_index.remove(task_id)
+        return True
+
+    def complete_tasks(self, task_ids: List[int], completed_date: Optional[str] = None) -> List[int]:
+        """Complete many active tasks in one transaction; returns the ids that were active"""
+        completed_date = completed_date or datetime.now().strftime('%Y-%m-%d %H:%M')
+        with self._transaction() as conn:
+            # The in-memory index mirrors the active rows while the lock is held
+            completed = [task_id for task_id in dict.fromkeys(task_ids) if task_id in self.active]
+            if not completed:
+                return []
+            conn.executemany(
+                "UPDATE tasks SET completed = 1, completed_date = ?, version = version + 1 WHERE id = ?",
+                [(completed_date, task_id) for task_id in completed]
+            )
+            self.data_version = timeline.record_events(
+                conn, [(task_id, "completed", completed_date) for task_id in completed]
+            )
+            for task_id in completed:
+                self.aggregator.task_completed(self.active.remove(task_id))
+                self.search_index.remove(task_id)
+        return completed
+
+    def delete_task(self, task_id: int, expected_version: Optional[int] = None) -> bool:
+        """Delete a task; returns False if it did not exist
+
+        With `expected_version`, raises ConcurrentModificationError instead when
+        the task is gone or was changed since that version was read.
+        """
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT category, priority, due_date, completed, version FROM tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+            if expected_version is not None and (row is None or row["version"] != expected_version):
+                raise ConcurrentModificationError(f"Task {task_id} was changed by someone else")
+            if row is None:
+                return False
+            conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            self.data_version = timeline.record_event(
+                conn, task_id, "deleted", datetime.now().strftime('%Y-%m-%d %H:%M')
+            )
+            self.active.remove(task_id)
+            self.search_index.remove(task_id)
+            self.aggregator.task_deleted(dict(row), completed=bool(row["completed"]))
+        return True
+
+    def apply_scores(self, scores: Dict[int, float]):
+        """Persist new priority scores for active tasks and re-rank them"""
+        if not scores:
+            return
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE tasks SET priority_score = ? WHERE id = ?",
+                [(score, task_id) for task_id, score in scores.items()]
+            )
+            self.active.update_scores(scores)
+
+    def update_guidance(self, task_id: int, guidance: str):
+        """Replace a task's AI guidance, e.g. when model output arrives"""
+        with self._transaction() as conn:
+            if conn.execute("UPDATE tasks SET ai_guidance = ? WHERE id = ?", (guidance, task_id)).rowcount == 0:
+                return
+            # Logged so other processes replay the new guidance onto their indexes
+            self.data_version = timeline.record_event(
+                conn, task_id, "guidance", datetime.now().strftime('%Y-%m-%d %H:%M')
+            )
+            task = self.active.get(task_id)
+            if task is not None:
+                task["ai_guidance"] = guidance
+
+    def archive_completed(self, before: str, segment_rows: int = archive.SEGMENT_ROWS) -> int:
+        """Move tasks completed before `before` (YYYY-MM-DD) into compressed archive segments
+
+        Each segment is written and committed in its own transaction, so other
+        sessions only wait for one segment at a time. Archived tasks keep
+        counting towards the insights and the timeline and are still exported,
+        but no longer take space in the live table. Returns the number archived.
+        """
+        archived = 0
+        while True:
+            with self._transaction() as conn:
+                rows = conn.execute(
+                    f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks "
+                    "WHERE completed = 1 AND completed_date < ? ORDER BY id LIMIT ?",
+                    (before, segment_rows)
+                ).fetchall()
+                if not rows:
+                    break
+                tasks = [self._row_to_task(row) for row in rows]
+                segment = archive.write_segment(self.archive_directory, tasks)
+                archive.record_segment(conn, segment, tasks, datetime.now().strftime('%Y-%m-%d %H:%M'))
+                ids = [(task["id"],) for task in tasks]
+                conn.executemany("DELETE FROM tasks WHERE id = ?", ids)
+                # The rollups already hold these tasks' events
+                conn.executemany("DELETE FROM task_events WHERE task_id = ?", ids)
+            archived += len(tasks)
+        self.archived_before = before
+        return archived
+
+    # Reads
+
+    def active_tasks(self) -> List[Dict]:
+        """Active tasks ranked by priority score, highest first"""
+        with self._current():
+            return self.active.ranked()
+
+    @staticmethod
+    def _active_filter(categories: Optional[List[str]], priorities: Optional[List[str]],
+                       due_from: Optional[str], due_to: Optional[str]) -> Tuple[str, list]:
+        """WHERE clause and parameters selecting the active tasks that match the filters"""
+        conditions, params = ["completed = 0"], []
+        for column, values in (("category", categories), ("priority", priorities)):
+            if values:
+                conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if due_from:
+            conditions.append("due_date >= ?")
+            params.append(due_from)
+        if due_to:
+            conditions.append("due_date <= ?")
+            params.append(due_to)
+        return " AND ".join(conditions), params
+
+    def count_active(self, categories: Optional[List[str]] = None,
+                     priorities: Optional[List[str]] = None,
+                     due_from: Optional[str] = None, due_to: Optional[str] = None) -> int:
+        """Number of active tasks matching the filters"""
+        if not (categories or priorities or due_from or due_to):
+            with self._current():
+                return len(self.active)
+        where, params = self._active_filter(categories, priorities, due_from, due_to)
+        return self._query(f"SELECT COUNT(*) FROM tasks WHERE {where}", tuple(params))[0][0]
+
+    def query_active(self, categories: Optional[List[str]] = None,
+                     priorities: Optional[List[str]] = None,
+                     due_from: Optional[str] = None, due_to: Optional[str] = None,
+                     offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """One page of ranked active tasks matching the filters"""
+        with self._current():
+            if not (categories or priorities or due_from or due_to):
+                return self.active.ranked(offset, limit)
+
+            where, params = self._active_filter(categories, priorities, due_from, due_to)
+            rows = self._conn.execute(
+                f"SELECT id FROM tasks WHERE {where} ORDER BY priority_score DESC, id LIMIT ? OFFSET ?",
+                (*params, -1 if limit is None else limit, offset)
+            ).fetchall()
+            return [self.active.get(row[0]) for row in rows]
+
+    def iter_task_chunks(self, completed: Optional[bool] = None,
+                         categories: Optional[List[str]] = None,
+                         created_from: Optional[str] = None, created_to: Optional[str] = None,
+                         chunk_rows: int = 10_000, include_archived: bool = True) -> Iterator[List[Dict]]:
+        """Stream matching tasks in bounded chunks from a separate read connection
+
+        Archived completed tasks come first, read from their segments on demand.
+        """
+        conditions, params = [], []
+        if completed is not None:
+            conditions.append("completed = ?")
+            params.append(int(completed))
+        if categories:
+            conditions.append(f"category IN ({', '.join('?' * len(categories))})")
+            params.extend(categories)
+        if created_from:
+            conditions.append("created_date >= ?")
+            params.append(created_from)
+        if created_to:
+            # created_date carries a time, so compare against the end of the day
+            conditions.append("created_date <= ?")
+            params.append(f"{created_to} 23:59")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        # WAL lets this reader see a consistent snapshot without blocking writers. One read
+        # transaction covers the manifest and the live table, so a segment archived in
+        # between can neither drop its tasks nor return them twice.
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("BEGIN")
+            if include_archived and completed is not False:
+                yield from archive.iter_archived_chunks(
+                    conn, self.archive_directory, categories, created_from,
+                    f"{created_to} 23:59" if created_to else None, chunk_rows
+                )
+            cursor = conn.execute(
+                f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks {where} ORDER BY id", params
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                yield [self._row_to_task(row) for row in rows]
+        finally:
+            conn.close()
+
+    def search_active(self, query: str, categories: Optional[List[str]] = None,
+                      priorities: Optional[List[str]] = None,
+                      due_from: Optional[str] = None, due_to: Optional[str] = None) -> List[Dict]:
+        """Active tasks matching a full-text query and the filters, best match first"""
+        def accept(task_id: int) -> bool:
+            task = self.active.get(task_id)
+            due_date = task.get("due_date") or ""
+            return ((not categories or task["category"] in categories)
+                    and (not priorities or task["priority"] in priorities)
+                    and (not due_from or due_date >= due_from)
+                    and (not due_to or (due_date and due_date <= due_to)))
+
+        with self._current():
+            return [self.active.get(task_id) for task_id in self.search_index.search(query, accept)]
+
+    def insights(self, today: Optional[str] = None) -> Dict:
+        """Productivity insights read from the incrementally maintained counters"""
+        with self._current():
+            return self.aggregator.snapshot(today)
+
+    def timeline(self, grain: str, start: date, end: date) -> List[Dict]:
+        """Tasks added, completed and deleted per day, week or month in a date range"""
+        with self._lock:
+            return timeline.read_rollups(self._conn, grain, start, end)
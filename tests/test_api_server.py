@@ -0,0 +1,19 @@
+"""Request validation in the headless HTTP API"""
+import http.client
+import json
+
+from api_server import create_server
+from workspaces import WorkspaceRegistry
+
+
+def test_bulk_complete_rejects_boolean_ids(tmp_path):
+    server = create_server(port=0, workspaces=WorkspaceRegistry(str(tmp_path), str(tmp_path / "tasks.db")))
+    connection = http.client.HTTPConnection("127.0.0.1", server.start())
+    try:
+        connection.request("POST", "/v1/tasks/bulk_complete", body=json.dumps({"ids": [True, 1]}))
+        response = connection.getresponse()
+        assert response.status == 400
+        response.read()
+    finally:
+        connection.close()
+        server.stop()
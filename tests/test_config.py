@@ -0,0 +1,24 @@
+"""Settings derived from the guidance data file"""
+import json
+
+from config import _default_category, _guidance_categories
+
+FALLBACK = ["Work", "Other"]
+
+
+def test_categories_and_default_come_from_the_guidance_data(tmp_path):
+    path = tmp_path / "guidance.json"
+    path.write_text(json.dumps({"default_category": "Misc", "category_tips": {"Errands": [], "Misc": []}}))
+
+    categories = _guidance_categories(str(path), FALLBACK)
+    assert categories == ["Errands", "Misc"]
+    assert _default_category(str(path), categories) == "Misc"
+
+
+def test_unreadable_guidance_data_falls_back_to_the_built_in_categories(tmp_path):
+    path = tmp_path / "guidance.json"
+    path.write_text("[not json")
+
+    assert _guidance_categories(str(path), FALLBACK) == FALLBACK
+    assert _default_category(str(path), FALLBACK) == "Other"
+    assert _default_category(str(tmp_path / "missing.json"), ["Errands", "Misc"]) == "Misc"
@@ -0,0 +1,101 @@
+"""HTTPGuidanceBackend against the local mock model server"""
+import threading
+import time
+
+import pytest
+
+from guidance_backends import GuidanceBackend, HTTPGuidanceBackend
+from mock_llm_server import start_mock_server
+
+
+def wait_until_idle(backend: HTTPGuidanceBackend, keys, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while any(backend.is_pending(key) for key in keys):
+        assert time.monotonic() < deadline, "guidance requests did not finish"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def mock_llm():
+    servers = []
+
+    def start(**options):
+        server = start_mock_server(port=0, **options)
+        servers.append(server)
+        return f"http://{server.server_address[0]}:{server.server_address[1]}/v1/guidance"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_http_backend_batches_requests_and_delivers_off_the_loop(mock_llm):
+    url = mock_llm(latency=0.05)
+    backend = HTTPGuidanceBackend(url, fallback=GuidanceBackend(), workers=1, batch_size=8, batch_wait=0.5)
+    results, threads = {}, set()
+
+    def on_result(key, text):
+        results[key] = text
+        threads.add(threading.current_thread().name)
+
+    keys = [("default", task_id) for task_id in range(16)]
+    try:
+        for key in keys:
+            assert backend.submit(key, (f"Task {key[1]}", "High", "Work"), on_result)
+        wait_until_idle(backend, keys)
+    finally:
+        backend.close()
+
+    assert sorted(results) == keys
+    assert backend.stats["completed"] == 16
+    assert backend.stats["requests"] == 2
+    assert all(name.startswith("guidance-callbacks") for name in threads)
+
+
+def test_http_backend_retries_then_gives_up(mock_llm):
+    url = mock_llm(latency=0.0, failure_rate=1.0)
+    backend = HTTPGuidanceBackend(url, fallback=GuidanceBackend(), workers=1, retries=2, batch_wait=0.0)
+    results = []
+    try:
+        backend.submit(("default", 1), ("Task", "Low", "Work"), lambda key, text: results.append(key))
+        wait_until_idle(backend, [("default", 1)])
+    finally:
+        backend.close()
+
+    assert results == []
+    assert backend.stats["requests"] == 3
+    assert backend.stats["failed"] == 1
+
+
+def test_http_backend_times_out_slow_requests(mock_llm):
+    url = mock_llm(latency=1.0)
+    backend = HTTPGuidanceBackend(url, fallback=GuidanceBackend(), workers=1, retries=0,
+                                  batch_wait=0.0, timeout=0.1)
+    results = []
+    started = time.monotonic()
+    try:
+        backend.submit(("default", 1), ("Task", "Low", "Work"), lambda key, text: results.append(key))
+        wait_until_idle(backend, [("default", 1)])
+    finally:
+        backend.close()
+
+    assert time.monotonic() - started < 1.0
+    assert results == []
+    assert backend.stats["failed"] == 1
+
+
+def test_http_backend_drops_work_when_the_queue_is_full(mock_llm):
+    url = mock_llm(latency=0.2)
+    backend = HTTPGuidanceBackend(url, fallback=GuidanceBackend(), workers=1, queue_size=1,
+                                  batch_size=1, batch_wait=0.0)
+    keys = [("default", task_id) for task_id in range(5)]
+    try:
+        for key in keys:
+            backend.submit(key, (f"Task {key[1]}", "Low", "Work"), lambda key, text: None)
+        wait_until_idle(backend, keys)
+    finally:
+        backend.close()
+
+    assert backend.stats["dropped"] >= 3
+    assert backend.stats["completed"] + backend.stats["dropped"] == len(keys)
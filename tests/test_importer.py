@@ -0,0 +1,80 @@
+"""Bulk import parsing, validation and error reporting"""
+import csv
+import io
+
+import pytest
+
+from config import AppConfig
+from importer import import_tasks, iter_rows, validate_row
+from scoring import PriorityScorer
+
+
+def rows(data: bytes, fmt: str):
+    return list(iter_rows(io.BytesIO(data), fmt))
+
+
+@pytest.fixture
+def small_csv_fields():
+    limit = csv.field_size_limit(12)
+    yield
+    csv.field_size_limit(limit)
+
+
+def test_csv_rows_carry_the_file_line_they_start_on():
+    data = b'\xef\xbb\xbftitle,description\nFirst,"spans\ntwo lines"\nSecond,\xff broken\nThird,ok\n'
+
+    assert rows(data, "CSV") == [
+        (2, {"title": "First", "description": "spans\ntwo lines"}, None),
+        (4, None, "Not valid UTF-8: invalid start byte at byte 7"),
+        (5, {"title": "Third", "description": "ok"}, None),
+    ]
+
+
+def test_malformed_csv_records_become_row_errors(small_csv_fields):
+    data = b"title\nShort\nFar too long for the limit\nAfter\n"
+
+    assert rows(data, "CSV") == [
+        (2, {"title": "Short"}, None),
+        (3, None, "Malformed CSV: field larger than field limit (12)"),
+        (4, {"title": "After"}, None),
+    ]
+
+
+def test_json_lines_report_each_bad_line_in_file_order():
+    data = b'{"title": "a"}\n\n[1]\n{bad\n\xff\n{"title": "b"}\n'
+
+    assert [(line, error) for line, _, error in rows(data, "JSON Lines")] == [
+        (1, None),
+        (3, "Expected a JSON object"),
+        (4, "Invalid JSON: Expecting property name enclosed in double quotes"),
+        (5, "Not valid UTF-8: invalid start byte at byte 0"),
+        (6, None),
+    ]
+
+
+def test_import_stores_valid_rows_and_reports_the_rest(store):
+    data = (b"title,category,priority,due_date\n"
+            b"Pay rent,Finance,High,2024-03-01\n"
+            b",Work,Low,\n"
+            b"Stretch,Health,Urgent,\n"
+            b"Read,Learning,Low,03/01/2024\n"
+            b"Plan week,Work,,\n")
+    report = import_tasks(io.BytesIO(data), "CSV", store, PriorityScorer(),
+                          lambda items: ["tip"] * len(items), today="2024-02-28")
+
+    assert report.imported == 2
+    assert report.errors == [
+        (3, "title is required"),
+        (4, "unknown priority 'Urgent'"),
+        (5, "due_date must be YYYY-MM-DD, got '03/01/2024'"),
+    ]
+    assert sorted(task["title"] for task in store.active_tasks()) == ["Pay rent", "Plan week"]
+
+
+def test_rows_without_a_category_get_the_guidance_default(monkeypatch):
+    monkeypatch.setattr(AppConfig, "TASK_CATEGORIES", ["Errands", "Misc"])
+    monkeypatch.setattr(AppConfig, "DEFAULT_CATEGORY", "Misc")
+
+    assert validate_row({"title": "Post letter"}, "2024-01-01 09:00")["category"] == "Misc"
+    with pytest.raises(ValueError):
+        validate_row({"title": "Post letter", "category": "Other"}, "2024-01-01 09:00")
@@ -0,0 +1,40 @@
+"""Incrementally maintained productivity insights"""
+from insights import InsightsAggregator
+
+
+def make_task(task_id: int, due_date, category: str = "Work", priority: str = "Medium"):
+    return {"id": task_id, "category": category, "priority": priority, "due_date": due_date}
+
+
+def test_overdue_count_follows_the_date_forwards_and_backwards():
+    tasks = [make_task(1, "2024-03-01"), make_task(2, "2024-03-01"), make_task(3, "2024-03-05"),
+             make_task(4, "2024-03-10"), make_task(5, None)]
+    aggregator = InsightsAggregator.from_tasks(tasks, [], today="2024-02-28")
+
+    assert aggregator.snapshot("2024-02-28")["overdue_count"] == 0
+    assert aggregator.snapshot("2024-03-02")["overdue_count"] == 2
+    # A task due today is not overdue yet
+    assert aggregator.snapshot("2024-03-05")["overdue_count"] == 2
+    assert aggregator.snapshot("2024-03-11")["overdue_count"] == 4
+    assert aggregator.snapshot("2024-03-03")["overdue_count"] == 2
+    assert aggregator.snapshot("2024-01-01")["overdue_count"] == 0
+
+
+def test_counters_track_completions_and_deletions():
+    tasks = [make_task(1, "2024-03-01"), make_task(2, "2024-03-01", category="Health"),
+             make_task(3, "2024-04-01", priority="High")]
+    aggregator = InsightsAggregator.from_tasks(tasks, [], today="2024-03-15")
+
+    aggregator.task_completed(tasks[0])
+    aggregator.task_deleted(tasks[1])
+    aggregator.task_deleted(tasks[0], completed=True)
+    aggregator.add_completed("Finance", "Low", 3)
+    snapshot = aggregator.snapshot("2024-03-15")
+
+    assert snapshot["overdue_count"] == 0
+    assert snapshot["active_tasks"] == 1
+    assert snapshot["total_tasks"] == 4
+    assert snapshot["completion_rate"] == 75
+    assert snapshot["category_distribution"] == {"Work": 1, "Finance": 3}
+    assert snapshot["priority_distribution"] == {"High": 1, "Low": 3}
+    assert aggregator.snapshot("2024-04-02")["overdue_count"] == 1
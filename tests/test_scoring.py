@@ -0,0 +1,21 @@
+"""Daily re-scoring of a store's active tasks"""
+from scoring import RescoringEngine
+
+
+def make_task(title: str, due_date, priority_score: float):
+    return {"title": title, "category": "Work", "priority": "High", "due_date": due_date,
+            "created_date": "2024-01-01 09:00", "priority_score": priority_score}
+
+
+def test_rescore_reports_only_the_tasks_whose_score_changed(store):
+    engine = RescoringEngine()
+    # High priority Work tasks score 12.0 without urgency and 24.0 when due within a day
+    soon, later, undated = store.add_tasks([
+        make_task("Soon", "2024-03-02", 12.0),
+        make_task("Later", "2024-06-01", 12.0),
+        make_task("Undated", None, 5.0),
+    ])
+
+    assert sorted(engine.run(store, "2024-03-01")) == [soon["id"], undated["id"]]
+    assert [task["id"] for task in store.active_tasks()] == [soon["id"], later["id"], undated["id"]]
+    assert engine.run(store, "2024-03-01") == []
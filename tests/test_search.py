@@ -0,0 +1,45 @@
+"""Inverted index behind task search"""
+import pytest
+
+import sorted_list
+from search import SearchIndex
+
+
+@pytest.fixture
+def index(monkeypatch):
+    # Tiny sublists spread the vocabulary over several of them
+    monkeypatch.setattr(sorted_list, "SUBLIST_LOAD", 2)
+    index = SearchIndex()
+    index.extend([
+        {"id": 1, "title": "Pay rent", "description": "transfer before the first"},
+        {"id": 2, "title": "Paint fence", "description": "buy paint and brushes"},
+        {"id": 3, "title": "Call plumber", "description": "kitchen pipe leaks"},
+    ])
+    index.add({"id": 4, "title": "Payroll report", "description": "send to finance"})
+    return index
+
+
+def test_terms_match_words_that_start_with_them(index):
+    assert index.search("pa") == [2, 1, 4]
+    # Exact matches outrank prefix matches
+    assert index.search("pay") == [1, 4]
+    # Single letters only match whole words
+    assert index.search("p") == []
+
+
+def test_every_term_must_match(index):
+    assert index.search("pay report") == [4]
+    assert index.search("paint kitchen") == []
+    assert index.search("pa", accept=lambda task_id: task_id != 2) == [1, 4]
+
+
+def test_removed_and_reindexed_tasks_leave_no_stale_words(index):
+    index.remove(4)
+    assert index.search("payroll") == []
+    assert list(index._vocabulary) == sorted(index._postings)
+
+    index.add({"id": 1, "title": "Renew passport"})
+    assert index.search("pay") == []
+    assert index.search("pass") == [1]
+    assert list(index._vocabulary) == sorted(index._postings)
+    assert len(index) == 3
@@ -0,0 +1,83 @@
+"""TaskCollection ranking and the SortedList underneath it"""
+import random
+
+import pytest
+
+import sorted_list
+from sorted_list import SortedList
+from task_collection import TaskCollection
+
+
+@pytest.fixture
+def small_sublists(monkeypatch):
+    # Tiny sublists make a few hundred values exercise splitting and merging
+    monkeypatch.setattr(sorted_list, "SUBLIST_LOAD", 4)
+
+
+def ranked_ids(collection: TaskCollection, offset: int = 0, limit=None):
+    return [task["id"] for task in collection.ranked(offset, limit)]
+
+
+def test_sorted_list_matches_a_sorted_reference(small_sublists):
+    rng = random.Random(7)
+    initial = rng.sample(range(1000), 50)
+    values, reference = SortedList(initial), sorted(initial)
+    for _ in range(2000):
+        if reference and rng.random() < 0.45:
+            value = rng.choice(reference)
+            values.remove(value)
+            reference.remove(value)
+        else:
+            value = rng.randrange(1000)
+            values.add(value)
+            reference.append(value)
+            reference.sort()
+    assert list(values) == reference
+    assert len(values) == len(reference)
+    assert values.slice(37, 61) == reference[37:61]
+    assert list(values.irange_from(500)) == [value for value in reference if value >= 500]
+    assert all(len(sublist) <= 8 for sublist in values._lists)
+
+
+def test_sorted_list_rejects_missing_values():
+    values = SortedList([1, 3])
+    with pytest.raises(ValueError):
+        values.remove(2)
+    assert 3 in values and 2 not in values
+
+
+def test_collection_ranks_by_score_then_id(small_sublists):
+    collection = TaskCollection()
+    collection.extend({"id": task_id, "priority_score": score}
+                      for task_id, score in [(1, 5.0), (2, 9.0), (3, 5.0)])
+    collection.add({"id": 4, "priority_score": 7.0})
+
+    assert ranked_ids(collection) == [2, 4, 1, 3]
+    assert ranked_ids(collection, 1, 2) == [4, 1]
+    with pytest.raises(KeyError):
+        collection.add({"id": 4, "priority_score": 1.0})
+
+
+def test_removed_and_rescored_tasks_leave_nothing_behind(small_sublists):
+    collection = TaskCollection()
+    collection.extend({"id": task_id, "priority_score": float(task_id)} for task_id in range(1, 101))
+
+    for task_id in range(1, 101, 2):
+        assert collection.remove(task_id)["id"] == task_id
+    assert collection.remove(1) is None
+    collection.update_scores({2: 1000.0, 4: -1.0, 999: 5.0})
+
+    assert len(collection._order) == len(collection) == 50
+    assert ranked_ids(collection)[:2] == [2, 100]
+    assert ranked_ids(collection)[-1] == 4
+    assert ranked_ids(collection, 48) == [6, 4]
+
+
+def test_bulk_rescore_rebuilds_the_order():
+    collection = TaskCollection()
+    collection.extend({"id": task_id, "priority_score": float(task_id)} for task_id in range(1, 21))
+
+    collection.update_scores({task_id: float(-task_id) for task_id in range(1, 21)})
+
+    assert ranked_ids(collection) == list(range(1, 21))
+    assert collection.get(5)["priority_score"] == -5.0
@@ -0,0 +1,12 @@
+"""TaskEngine behaviour shared by the app and the HTTP API"""
+from config import AppConfig
+from guidance import GuidanceEngine
+from guidance_backends import TemplateGuidanceBackend
+from task_engine import TaskEngine
+
+
+def test_tasks_without_a_due_date_score_like_a_rescore(store):
+    engine = TaskEngine(store, TemplateGuidanceBackend(GuidanceEngine.from_file(AppConfig.GUIDANCE_DATA_PATH)))
+    task = engine.new_task("Someday", "Work", "High", None)
+
+    assert task["priority_score"] == engine.rescoring.scorer.score_tasks([task], "2024-01-01")[0]
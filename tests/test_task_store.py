@@ -0,0 +1,210 @@
+"""TaskStore persistence: migrations, optimistic concurrency, archival and shared files"""
+import os
+import sqlite3
+
+import pytest
+
+import archive
+import task_store
+from task_store import MIGRATIONS, ConcurrentModificationError, TaskStore
+
+
+def make_task(title: str, category: str = "Work", priority: str = "Medium", **fields):
+    return {"title": title, "category": category, "priority": priority, "due_date": "2030-01-01",
+            "created_date": "2024-01-01 09:00", "priority_score": 1.0, **fields}
+
+
+# Migrations
+
+def test_migrations_upgrade_an_existing_database(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(MIGRATIONS[0])
+    conn.execute(
+        "INSERT INTO tasks (title, category, priority, created_date, priority_score) "
+        "VALUES ('Legacy', 'Work', 'High', '2024-01-01 09:00', 2.0)"
+    )
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+
+    store = TaskStore(path)
+    try:
+        assert store._query("PRAGMA user_version")[0][0] == len(MIGRATIONS)
+        assert [(task["title"], task["version"]) for task in store.active_tasks()] == [("Legacy", 1)]
+        assert store.insights("2024-01-02")["total_tasks"] == 1
+    finally:
+        store.close()
+
+
+# Optimistic concurrency
+
+def test_complete_with_a_stale_version_is_rejected(store):
+    task = store.add_task(make_task("Report"))
+    assert store.complete_task(task["id"], expected_version=task["version"])
+
+    with pytest.raises(ConcurrentModificationError):
+        store.complete_task(task["id"], expected_version=task["version"])
+
+
+def test_delete_with_a_stale_version_is_rejected(store):
+    task = store.add_task(make_task("Report"))
+    store.complete_task(task["id"])
+
+    with pytest.raises(ConcurrentModificationError):
+        store.delete_task(task["id"], expected_version=task["version"])
+    assert store.delete_task(task["id"], expected_version=task["version"] + 1)
+
+
+def test_data_version_keeps_growing_across_reopens(store):
+    task = store.add_task(make_task("Report"))
+    store.complete_task(task["id"])
+    version = store.data_version
+
+    reopened = TaskStore(store.path)
+    try:
+        assert reopened.data_version == version
+        reopened.add_task(make_task("Next"))
+        assert reopened.data_version > version
+    finally:
+        reopened.close()
+
+
+# Archival
+
+def test_archive_round_trip_keeps_insights_and_exports(store):
+    store.add_tasks([make_task(f"Old {index}", category=("Work", "Health")[index % 2]) for index in range(7)])
+    store.add_task(make_task("Still open"))
+    for task in store.active_tasks():
+        if task["title"].startswith("Old"):
+            store.complete_task(task["id"], completed_date="2024-02-01 10:00")
+    before = store.insights("2024-06-01")
+    exported = sorted(task["id"] for chunk in store.iter_task_chunks() for task in chunk)
+
+    assert store.archive_completed("2024-05-01", segment_rows=3) == 7
+
+    assert sorted(os.listdir(store.archive_directory)) == sorted(
+        row[0] for row in store._query("SELECT file_name FROM archive_segments")
+    )
+    assert len(os.listdir(store.archive_directory)) == 3
+    assert store._query("SELECT COUNT(*) FROM tasks")[0][0] == 1
+    assert store.insights("2024-06-01") == before
+    assert sorted(task["id"] for chunk in store.iter_task_chunks() for task in chunk) == exported
+    assert len([task for chunk in store.iter_task_chunks(completed=True, categories=["Health"])
+                for task in chunk]) == 3
+
+    reopened = TaskStore(store.path)
+    try:
+        assert reopened.insights("2024-06-01") == before
+        counts = sorted(map(tuple, archive.archived_counts(reopened._conn)))
+        assert counts == [("Health", "Medium", 3), ("Work", "Medium", 4)]
+    finally:
+        reopened.close()
+
+
+def test_export_sees_one_snapshot_while_archiving(store):
+    tasks = store.add_tasks([make_task(f"Done {index}") for index in range(6)])
+    for index, task in enumerate(tasks):
+        store.complete_task(task["id"], completed_date=f"2024-0{1 if index < 2 else 2}-01 10:00")
+    store.archive_completed("2024-01-15")
+
+    chunks = store.iter_task_chunks(chunk_rows=1)
+    exported = [task["id"] for task in next(chunks)]
+    assert store.archive_completed("2024-05-01") == 4
+    exported += [task["id"] for chunk in chunks for task in chunk]
+
+    assert sorted(exported) == [task["id"] for task in tasks]
+
+
+# Several stores on one file
+
+def test_stores_sharing_a_file_see_each_others_writes(store):
+    other = TaskStore(store.path)
+    try:
+        first = store.add_task(make_task("From the app"))
+        second = other.add_task(make_task("From the API"))
+        assert first["id"] != second["id"]
+        assert store.count_active() == other.count_active() == 2
+
+        other.complete_task(first["id"])
+        assert [task["id"] for task in store.active_tasks()] == [second["id"]]
+        assert store.insights("2024-01-02")["completion_rate"] == 50
+        assert store.data_version == other.data_version
+    finally:
+        other.close()
+
+
+def test_bulk_adds_commit_in_batches(store, monkeypatch):
+    monkeypatch.setattr(task_store, "ADD_BATCH_ROWS", 2)
+    commits, add_batch = [], store._add_batch
+    monkeypatch.setattr(store, "_add_batch", lambda tasks: commits.append(len(tasks)) or add_batch(tasks))
+
+    added = store.add_tasks([make_task(f"Task {index}") for index in range(5)])
+
+    assert commits == [2, 2, 1]
+    assert [task["id"] for task in added] == [1, 2, 3, 4, 5]
+    assert store.count_active() == 5
+
+
+def test_reopening_an_up_to_date_store_writes_nothing(store):
+    store.add_task(make_task("Report"))
+    version = store._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    TaskStore(store.path).close()
+
+    assert store._conn.execute("PRAGMA data_version").fetchone()[0] == version
+
+
+def test_foreign_writes_are_replayed_without_a_reload(store, monkeypatch):
+    tasks = store.add_tasks([make_task(f"Task {index}", category=("Work", "Health")[index % 2])
+                             for index in range(8)])
+    store.complete_task(tasks[0]["id"])
+    other = TaskStore(store.path)
+    try:
+        monkeypatch.setattr(store, "_load_active", lambda: pytest.fail("full reload"))
+        other.add_tasks([make_task("Added"), make_task("Added done", completed_date="2024-01-03 10:00")])
+        other.complete_task(tasks[1]["id"])
+        other.delete_task(tasks[2]["id"])
+        other.delete_task(tasks[0]["id"])
+        other.update_guidance(tasks[3]["id"], "Start with the outline")
+
+        assert [task["id"] for task in store.active_tasks()] == [task["id"] for task in other.active_tasks()]
+        assert store.active.get(tasks[3]["id"])["ai_guidance"] == "Start with the outline"
+        assert store.insights("2024-01-02") == other.insights("2024-01-02")
+        assert [task["id"] for task in store.search_active("added")] == [tasks[-1]["id"] + 1]
+        assert store.search_active("task 2") == []
+        assert store.data_version == other.data_version
+    finally:
+        other.close()
+
+
+def test_events_removed_by_archiving_force_a_full_reload(store, monkeypatch):
+    tasks = store.add_tasks([make_task(f"Task {index}") for index in range(4)])
+    other = TaskStore(store.path)
+    try:
+        other.complete_task(tasks[0]["id"], completed_date="2024-01-02 10:00")
+        other.archive_completed("2024-02-01")
+        reloads = []
+        load_active = store._load_active
+        monkeypatch.setattr(store, "_load_active", lambda: reloads.append(1) or load_active())
+
+        assert [task["id"] for task in store.active_tasks()] == [task["id"] for task in other.active_tasks()]
+        assert store.insights("2024-01-02") == other.insights("2024-01-02")
+        assert reloads == [1]
+    finally:
+        other.close()
+
+
+def test_a_rolled_back_write_does_not_hide_later_foreign_events(store, monkeypatch):
+    store.add_task(make_task("First"))
+    other = TaskStore(store.path)
+    try:
+        with monkeypatch.context() as patch:
+            patch.setattr(store.active, "add", lambda task: 1 / 0)
+            with pytest.raises(ZeroDivisionError):
+                store.add_task(make_task("Rolled back"))
+        other.add_task(make_task("From the API"))
+
+        assert [task["title"] for task in store.active_tasks()] == ["First", "From the API"]
+    finally:
+        other.close()
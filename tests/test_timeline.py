@@ -0,0 +1,80 @@
+"""Event-log rollups behind the productivity timeline"""
+from datetime import date, timedelta
+
+import pytest
+
+import timeline
+
+
+def make_task(title: str, created_date: str, **fields):
+    return {"title": title, "category": "Work", "priority": "Medium", "due_date": None,
+            "created_date": created_date, "priority_score": 1.0, **fields}
+
+
+def totals(rows, kind):
+    return {row["bucket"].isoformat(): row[kind] for row in rows if row[kind]}
+
+
+def test_rollups_count_events_per_day_week_and_month(store):
+    first, second, _ = store.add_tasks([
+        make_task("Mon", "2024-01-01 09:00"),
+        make_task("Wed", "2024-01-03 09:00"),
+        make_task("Done", "2024-01-31 09:00", completed_date="2024-02-01 10:00"),
+    ])
+    store.complete_task(first["id"], completed_date="2024-01-08 12:00")
+    store.delete_task(second["id"])
+
+    days = store.timeline("day", date(2024, 1, 1), date(2024, 2, 1))
+    assert len(days) == 32
+    assert totals(days, "added") == {"2024-01-01": 1, "2024-01-03": 1, "2024-01-31": 1}
+    assert totals(days, "completed") == {"2024-01-08": 1, "2024-02-01": 1}
+
+    weeks = store.timeline("week", date(2024, 1, 3), date(2024, 2, 4))
+    assert weeks[0]["bucket"] == date(2024, 1, 1)
+    assert totals(weeks, "added") == {"2024-01-01": 2, "2024-01-29": 1}
+    assert totals(weeks, "completed") == {"2024-01-08": 1, "2024-01-29": 1}
+
+    months = store.timeline("month", date(2024, 1, 15), date(2024, 2, 15))
+    assert totals(months, "added") == {"2024-01-01": 3}
+    assert totals(months, "completed") == {"2024-01-01": 1, "2024-02-01": 1}
+    # Deletions are stamped with the time they happen
+    assert sum(row["deleted"] for row in store.timeline("month", date.today(), date.today())) == 1
+
+
+def test_catch_up_folds_events_the_rollups_have_not_seen(store):
+    store.add_task(make_task("Logged", "2024-05-05 09:00"))
+    with store._transaction() as conn:
+        conn.execute("DELETE FROM task_rollups")
+        conn.execute("UPDATE rollup_state SET last_event_id = 0")
+        timeline.catch_up(conn)
+
+    assert totals(store.timeline("day", date(2024, 5, 5), date(2024, 5, 5)), "added") == {"2024-05-05": 1}
+
+
+@pytest.mark.parametrize("grain", timeline.GRAINS)
+def test_bucket_count_matches_bucket_range(grain):
+    start = date(2023, 12, 28)
+    for days in (0, 1, 6, 7, 30, 31, 400):
+        end = start + timedelta(days=days)
+        assert timeline.bucket_count(grain, start, end) == len(timeline.bucket_range(grain, start, end))
+
+
+def test_fit_grain_picks_the_finest_grain_within_the_limit():
+    start, end = date(2024, 1, 1), date(2024, 12, 31)
+    assert timeline.fit_grain("day", start, end, 400) == "day"
+    assert timeline.fit_grain("day", start, end, 100) == "week"
+    assert timeline.fit_grain("day", start, end, 20) == "month"
+    assert timeline.fit_grain("week", start, end, 400) == "week"
+    # Nothing fits, so the coarsest grain is used and downsampled afterwards
+    assert timeline.fit_grain("day", start, end, 5) == "month"
+
+
+def test_downsample_merges_adjacent_buckets():
+    rows = [{"bucket": date(2024, 1, day), "added": 1, "completed": day % 2, "deleted": 0}
+            for day in range(1, 11)]
+    merged = timeline.downsample(rows, 4)
+
+    assert len(merged) == 4
+    assert [row["bucket"] for row in merged] == [date(2024, 1, day) for day in (1, 4, 7, 10)]
+    assert sum(row["added"] for row in merged) == 10
+    assert sum(row["completed"] for row in merged) == 5
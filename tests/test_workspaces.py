@@ -0,0 +1,62 @@
+"""Workspace leases over per-workspace task stores"""
+import threading
+
+import pytest
+
+import workspaces
+from task_store import TaskStore
+from workspaces import WorkspaceRegistry
+
+
+@pytest.fixture
+def slow_store(monkeypatch):
+    """Stores for workspace "slow" block in their constructor until released"""
+    started, release = threading.Event(), threading.Event()
+
+    def open_store(path):
+        if path.endswith("slow.db"):
+            started.set()
+            assert release.wait(5)
+        return TaskStore(path)
+
+    monkeypatch.setattr(workspaces, "TaskStore", open_store)
+    return started, release
+
+
+def test_opening_one_store_does_not_block_other_workspaces(tmp_path, slow_store):
+    started, release = slow_store
+    registry = WorkspaceRegistry(str(tmp_path), str(tmp_path / "tasks.db"))
+    leased = []
+
+    def lease_slow():
+        with registry.lease("slow") as store:
+            leased.append(store)
+
+    threads = [threading.Thread(target=lease_slow) for _ in range(2)]
+    threads[0].start()
+    assert started.wait(5)
+    threads[1].start()
+    with registry.lease("fast") as store:
+        assert store.count_active() == 0
+    assert not leased
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    # The session that waited got the store the first one opened
+    assert len(leased) == 2 and leased[0] is leased[1]
+    registry.close()
+
+
+def test_a_failed_open_is_retried_by_the_next_lease(tmp_path, monkeypatch):
+    registry = WorkspaceRegistry(str(tmp_path), str(tmp_path / "tasks.db"))
+    monkeypatch.setattr(workspaces, "TaskStore", lambda path: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        with registry.lease("team"):
+            pass
+    monkeypatch.setattr(workspaces, "TaskStore", TaskStore)
+
+    with registry.lease("team") as store:
+        assert store.count_active() == 0
+    assert not registry._leases and not registry._opening
+    registry.close()
@@ -0,0 +1,157 @@
+import sqlite3
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+GRAINS = ("day", "week", "month")
+EVENT_KINDS = ("added", "completed", "deleted")
+
+# Events are folded into the rollups in chunks of this many rows when catching up
+CATCH_UP_CHUNK = 50_000
+
+
+def bucket_for(grain: str, day: date) -> date:
+    """First day of the bucket that `day` falls into"""
+    if grain == "day":
+        return day
+    if grain == "week":
+        return day - timedelta(days=day.weekday())
+    if grain == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unknown timeline grain {grain!r}")
+
+
+def next_bucket(grain: str, bucket: date) -> date:
+    if grain == "day":
+        return bucket + timedelta(days=1)
+    if grain == "week":
+        return bucket + timedelta(days=7)
+    if bucket.month == 12:
+        return bucket.replace(year=bucket.year + 1, month=1)
+    return bucket.replace(month=bucket.month + 1)
+
+
+def bucket_range(grain: str, start: date, end: date) -> List[date]:
+    """Every bucket between `start` and `end`, inclusive"""
+    buckets = []
+    bucket = bucket_for(grain, start)
+    while bucket <= end:
+        buckets.append(bucket)
+        bucket = next_bucket(grain, bucket)
+    return buckets
+
+
+def bucket_count(grain: str, start: date, end: date) -> int:
+    """Number of buckets `bucket_range` would return, without building them"""
+    first = bucket_for(grain, start)
+    if grain == "day":
+        return (end - first).days + 1
+    if grain == "week":
+        return (end - first).days // 7 + 1
+    return (end.year - first.year) * 12 + end.month - first.month + 1
+
+
+def fit_grain(grain: str, start: date, end: date, max_points: int) -> str:
+    """The finest grain at or above `grain` that keeps the range within `max_points` buckets"""
+    for candidate in GRAINS[GRAINS.index(grain):]:
+        if bucket_count(candidate, start, end) <= max_points:
+            return candidate
+    return GRAINS[-1]
+
+
+def downsample(timeline: List[Dict], max_points: int) -> List[Dict]:
+    """Merge runs of adjacent buckets so at most `max_points` remain"""
+    if len(timeline) <= max_points:
+        return timeline
+    stride = -(-len(timeline) // max_points)
+    merged = []
+    for start in range(0, len(timeline), stride):
+        group = timeline[start:start + stride]
+        merged.append({
+            "bucket": group[0]["bucket"],
+            **{kind: sum(row[kind] for row in group) for kind in EVENT_KINDS}
+        })
+    return merged
+
+
+def record_event(conn: sqlite3.Connection, task_id: int, kind: str, occurred_at: str) -> int:
+    """Append one event to the log and fold it into the rollups"""
+    return record_events(conn, [(task_id, kind, occurred_at)])
+
+
+def record_events(conn: sqlite3.Connection, events: List[Tuple[int, str, str]]) -> int:
+    """Append (task_id, kind, occurred_at) events; runs inside the caller's transaction
+
+    Returns the id of the last event, which only ever grows.
+    """
+    if not events:
+        return last_event_id(conn)
+    conn.executemany(
+        "INSERT INTO task_events (task_id, kind, occurred_at) VALUES (?, ?, ?)", events
+    )
+    _apply(conn, ((kind, occurred_at) for _, kind, occurred_at in events))
+    last_id = conn.execute("SELECT MAX(id) FROM task_events").fetchone()[0]
+    conn.execute("UPDATE rollup_state SET last_event_id = ?", (last_id,))
+    return last_id
+
+
+def last_event_id(conn: sqlite3.Connection) -> int:
+    """Id of the newest event folded into the rollups"""
+    return conn.execute("SELECT last_event_id FROM rollup_state").fetchone()[0]
+
+
+def catch_up(conn: sqlite3.Connection):
+    """Fold any events that are not yet reflected in the rollups"""
+    last_id = conn.execute("SELECT last_event_id FROM rollup_state").fetchone()[0]
+    while True:
+        rows = conn.execute(
+            "SELECT id, kind, occurred_at FROM task_events WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, CATCH_UP_CHUNK)
+        ).fetchall()
+        if not rows:
+            break
+        _apply(conn, ((row[1], row[2]) for row in rows))
+        last_id = rows[-1][0]
+        conn.execute("UPDATE rollup_state SET last_event_id = ?", (last_id,))
+
+
+def _apply(conn: sqlite3.Connection, events: Iterable[Tuple[str, str]]):
+    counts: Counter = Counter()
+    for kind, occurred_at in events:
+        # Other events, such as guidance updates, are logged for replay but not counted
+        if kind not in EVENT_KINDS:
+            continue
+        day = date.fromisoformat(occurred_at[:10])
+        for grain in GRAINS:
+            counts[(grain, bucket_for(grain, day).isoformat(), kind)] += 1
+    conn.executemany(
+        "INSERT INTO task_rollups (grain, bucket, added, completed, deleted) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (grain, bucket) DO UPDATE SET added = added + excluded.added, "
+        "completed = completed + excluded.completed, deleted = deleted + excluded.deleted",
+        [
+            (grain, bucket, *(count if kind == k else 0 for k in EVENT_KINDS))
+            for (grain, bucket, kind), count in counts.items()
+        ]
+    )
+
+
+def read_rollups(conn: sqlite3.Connection, grain: str, start: date, end: date) -> List[Dict]:
+    """Zero-filled buckets for the date range, read only from the rollup rows in range"""
+    if grain not in GRAINS:
+        raise ValueError(f"Unknown timeline grain {grain!r}")
+    rows = conn.execute(
+        "SELECT bucket, added, completed, deleted FROM task_rollups "
+        "WHERE grain = ? AND bucket BETWEEN ? AND ?",
+        (grain, bucket_for(grain, start).isoformat(), end.isoformat())
+    ).fetchall()
+    stored = {row[0]: row for row in rows}
+    timeline = []
+    for bucket in bucket_range(grain, start, end):
+        row = stored.get(bucket.isoformat())
+        timeline.append({
+            "bucket": bucket,
+            "added": row[1] if row else 0,
+            "completed": row[2] if row else 0,
+            "deleted": row[3] if row else 0
+        })
+    return timeline
@@ -0,0 +1,116 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from task_store import TaskStore
+
+# Workspace names double as file names, so they are limited to a safe slug
+WORKSPACE_NAME_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_-]{0,63}$")
+
+
+def normalize_workspace(name: str) -> str:
+    """Lower-case and validate a workspace name"""
+    name = (name or "").strip().lower()
+    if not WORKSPACE_NAME_PATTERN.match(name):
+        raise ValueError("Workspace names use 1-64 letters, digits, '-' or '_' and start with a letter or digit")
+    return name
+
+
+class WorkspaceRegistry:
+    """Per-user or per-team task stores shared by every session in the process
+
+    Each workspace is its own SQLite file, so workspaces never contend for one
+    write lock. At most `max_open` stores are kept open; the least recently used
+    idle store is closed when another one is needed. Stores are handed out as
+    leases so a store is never closed while a session is still using it.
+    Opening a store (which may migrate or load it) happens outside the
+    registry lock; sessions asking for a workspace that is still opening wait
+    on its placeholder instead of blocking every other workspace.
+    """
+
+    def __init__(self, directory: str, default_path: str, default_name: str = "default", max_open: int = 32):
+        self.directory = directory
+        self.default_path = default_path
+        self.default_name = normalize_workspace(default_name)
+        self.max_open = max(1, max_open)
+        self._stores: "OrderedDict[str, TaskStore]" = OrderedDict()
+        self._leases: Dict[str, int] = {}
+        self._opening: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, name: str) -> str:
+        name = normalize_workspace(name)
+        if name == self.default_name:
+            return self.default_path
+        return os.path.join(self.directory, f"{name}.db")
+
+    def names(self) -> List[str]:
+        """The default workspace followed by every workspace with a database on disk"""
+        names = {self.default_name}
+        if os.path.isdir(self.directory):
+            names.update(file_name[:-3] for file_name in os.listdir(self.directory)
+                         if file_name.endswith(".db") and WORKSPACE_NAME_PATTERN.match(file_name[:-3]))
+        return [self.default_name] + sorted(names - {self.default_name})
+
+    @contextmanager
+    def lease(self, name: Optional[str] = None) -> Iterator[TaskStore]:
+        """Open (or reuse) a workspace's store for the duration of the block"""
+        name = normalize_workspace(name or self.default_name)
+        opening, opener = None, False
+        with self._lock:
+            self._leases[name] = self._leases.get(name, 0) + 1
+            store = self._stores.get(name)
+            if store is not None:
+                self._stores.move_to_end(name)
+            elif name in self._opening:
+                opening = self._opening[name]
+            else:
+                opening = self._opening[name] = Future()
+                opener = True
+        try:
+            if store is None:
+                store = self._open(name, opening) if opener else opening.result()
+            yield store
+        finally:
+            with self._lock:
+                self._leases[name] -= 1
+                if not self._leases[name]:
+                    del self._leases[name]
+                self._evict_idle()
+
+    def _open(self, name: str, opening: Future) -> TaskStore:
+        """Open a workspace's store and publish it to sessions waiting on `opening`"""
+        try:
+            path = self.path_for(name)
+            if path != self.default_path:
+                os.makedirs(self.directory, exist_ok=True)
+            store = TaskStore(path)
+        except BaseException as error:
+            with self._lock:
+                del self._opening[name]
+            opening.set_exception(error)
+            raise
+        with self._lock:
+            del self._opening[name]
+            self._stores[name] = store
+            self._evict_idle()
+        opening.set_result(store)
+        return store
+
+    def _evict_idle(self):
+        """Close least recently used stores that no session holds, down to `max_open`"""
+        for name in list(self._stores):
+            if len(self._stores) <= self.max_open:
+                break
+            if name not in self._leases:
+                self._stores.pop(name).close()
+
+    def close(self):
+        with self._lock:
+            for store in self._stores.values():
+                store.close()
+            self._stores.clear()